@@ -101,10 +101,73 @@ function translate(key) {
     return langData?.translations?.[key] || key;
 }
 
+// Compact Results
+// Media type of the compact result layout, see serever/compact.py
+const COMPACT_MIMETYPE = 'application/vnd.accessible-pdf.compact+json';
+
+// Fields the server leaves out when they can be derived from the record
+const COMPACT_IMPLIED_FIELDS = {
+    tables: { headers: table => (table.rows && table.rows.length ? table.rows[0] : []) },
+    images: { 'aria-label': img => `Image described as: ${img.alt_text}` },
+    formulas: { role: () => 'math', 'aria-label': formula => formula.description }
+};
+
+// Turn compact columns back into a list of records
+function expandCompactRecords(encoded, implied) {
+    const records = Array.from({ length: encoded.count }, () => ({}));
+    const derived = [];
+    Object.entries(encoded.columns).forEach(([field, values]) => {
+        if (values === null) {
+            derived.push([field, null]);
+            return;
+        }
+        values.forEach((value, index) => { records[index][field] = value; });
+        if (implied[field]) {
+            derived.push([field, values]);
+        }
+    });
+    // Derived fields only depend on fields that are sent as they are
+    derived.forEach(([field, values]) => {
+        records.forEach((record, index) => {
+            if (values === null || values[index] === null) {
+                record[field] = implied[field](record);
+            }
+        });
+    });
+    return records;
+}
+
+// Expand a result in the compact layout into the regular /parse-pdf layout
+function expandCompactResult(data) {
+    if (!data || data.format !== 'compact-v1') {
+        return data;
+    }
+    const expanded = { ...data };
+    delete expanded.format;
+    if (Array.isArray(data.documents)) {
+        expanded.documents = data.documents.map(expandCompactResult);
+        return expanded;
+    }
+    if (data.text && typeof data.text === 'object') {
+        const { strings, units } = data.text;
+        expanded.text = units.map(unit => (typeof unit === 'number'
+            ? `<span role="text" aria-label="${strings[unit]}">${strings[unit]}</span>`
+            : unit)).join('');
+    }
+    Object.entries(COMPACT_IMPLIED_FIELDS).forEach(([key, implied]) => {
+        if (data[key] && !Array.isArray(data[key])) {
+            expanded[key] = expandCompactRecords(data[key], implied);
+        }
+    });
+    return expanded;
+}
+
 // Display Results with Multilingual Support
 // Main function to display extracted PDF content
-function displayResults(data) {
-    resultsDiv.innerHTML = '';
+// target and idPrefix let streamed pages render into their own container
+function displayResults(data, target = resultsDiv, idPrefix = '') {
+    data = expandCompactResult(data);
+    target.innerHTML = '';
     
     // Text Content
     if (data.metadata) {
@@ -142,7 +205,7 @@ function displayResults(data) {
         addMetaItem('Modified', data.metadata.modificationDate);
         
         metaSection.appendChild(metaList);
-        resultsDiv.appendChild(metaSection);
+        target.appendChild(metaSection);
     }
 
     // Text Content Section (Enhanced)
@@ -154,12 +217,12 @@ function displayResults(data) {
         
         const heading = document.createElement('h2');
         heading.textContent = translate('Document Text');
-        heading.setAttribute('id', 'text-section-heading');
+        heading.setAttribute('id', `${idPrefix}text-section-heading`);
         textSection.appendChild(heading);
         
         const textContent = document.createElement('div');
         textContent.className = 'text-content';
-        textContent.setAttribute('aria-labelledby', 'text-section-heading');
+        textContent.setAttribute('aria-labelledby', `${idPrefix}text-section-heading`);
         
         // Process text with paragraph detection
         const paragraphs = data.text.split(/\n\s*\n/);
@@ -185,7 +248,7 @@ function displayResults(data) {
         textSection.appendChild(readingInfo);
         
         textSection.appendChild(textContent);
-        resultsDiv.appendChild(textSection);
+        target.appendChild(textSection);
     }
 
     // Tables Section (Enhanced)
@@ -197,7 +260,7 @@ function displayResults(data) {
         
         const heading = document.createElement('h2');
         heading.textContent = translate('Tables');
-        heading.setAttribute('id', 'tables-section-heading');
+        heading.setAttribute('id', `${idPrefix}tables-section-heading`);
         tableSection.appendChild(heading);
         
      // Add table of contents for navigation if many tables
@@ -209,7 +272,7 @@ function displayResults(data) {
             data.tables.forEach((table, index) => {
                 const li = document.createElement('li');
                 const a = document.createElement('a');
-                a.href = `#table-${index}`;
+                a.href = `#${idPrefix}table-${index}`;
                 a.textContent = `${translate('Table')} ${index + 1}` + 
                                (table.summary ? `: ${table.summary}` : '');
                 li.appendChild(a);
@@ -224,18 +287,18 @@ function displayResults(data) {
         data.tables.forEach((table, index) => {
             const tableContainer = document.createElement('div');
             tableContainer.className = 'table-container';
-            tableContainer.id = `table-${index}`;
+            tableContainer.id = `${idPrefix}table-${index}`;
             tableContainer.setAttribute('role', 'region');
             tableContainer.setAttribute('aria-label', table.summary || `${translate('Table')} ${index + 1}`);
 
              // Create accessible table with proper markup
             const tableEl = document.createElement('table');
             tableEl.className = 'accessible-table';
-            tableEl.setAttribute('aria-describedby', `table-desc-${index}`);
+            tableEl.setAttribute('aria-describedby', `${idPrefix}table-desc-${index}`);
             
             // Enhanced caption with navigation
             const caption = document.createElement('caption');
-            caption.id = `table-desc-${index}`;
+            caption.id = `${idPrefix}table-desc-${index}`;
             
             const captionText = document.createElement('span');
             captionText.textContent = table.summary || `${translate('Table')} ${index + 1}`;
@@ -249,7 +312,7 @@ function displayResults(data) {
                 const prevBtn = document.createElement('button');
                 prevBtn.className = 'table-nav-btn';
                 prevBtn.textContent = `← ${translate('Previous Table')}`;
-                prevBtn.onclick = () => document.getElementById(`table-${index-1}`).scrollIntoView();
+                prevBtn.onclick = () => document.getElementById(`${idPrefix}table-${index-1}`).scrollIntoView();
                 navDiv.appendChild(prevBtn);
             }
             
@@ -257,7 +320,7 @@ function displayResults(data) {
                 const nextBtn = document.createElement('button');
                 nextBtn.className = 'table-nav-btn';
                 nextBtn.textContent = `${translate('Next Table')} →`;
-                nextBtn.onclick = () => document.getElementById(`table-${index+1}`).scrollIntoView();
+                nextBtn.onclick = () => document.getElementById(`${idPrefix}table-${index+1}`).scrollIntoView();
                 navDiv.appendChild(nextBtn);
             }
             
@@ -312,7 +375,7 @@ function displayResults(data) {
             tableSection.appendChild(tableContainer);
         });
         
-        resultsDiv.appendChild(tableSection);
+        target.appendChild(tableSection);
     }
 
     // Images Section (Enhanced)
@@ -324,7 +387,7 @@ function displayResults(data) {
         
         const heading = document.createElement('h2');
         heading.textContent = translate('Images');
-        heading.setAttribute('id', 'images-section-heading');
+        heading.setAttribute('id', `${idPrefix}images-section-heading`);
         imageSection.appendChild(heading);
         
 
@@ -362,7 +425,7 @@ function displayResults(data) {
             // Create image container with expandable view
             const imgContainer = document.createElement('div');
             imgContainer.className = 'image-container';
-            imgContainer.id = `image-${index}`;
+            imgContainer.id = `${idPrefix}image-${index}`;
             imgContainer.setAttribute('role', 'figure');
             imgContainer.setAttribute('aria-label', img['aria-label'] || `${translate('Image')} ${index + 1}`);
             
@@ -399,11 +462,11 @@ function displayResults(data) {
             if (pdfState.preferences.explanationDepth === 'detailed') {
                 const descLabel = document.createElement('label');
                 descLabel.textContent = translate('Add your description') + ':';
-                descLabel.htmlFor = `image-desc-${index}`;
+                descLabel.htmlFor = `${idPrefix}image-desc-${index}`;
                 imgInfo.appendChild(descLabel);
                 
                 const descInput = document.createElement('textarea');
-                descInput.id = `image-desc-${index}`;
+                descInput.id = `${idPrefix}image-desc-${index}`;
                 descInput.rows = 2;
                 descInput.placeholder = translate('Describe this image in your own words');
                 imgInfo.appendChild(descInput);
@@ -414,7 +477,7 @@ function displayResults(data) {
         });
         
         imageSection.appendChild(imagesContainer);
-        resultsDiv.appendChild(imageSection);
+        target.appendChild(imageSection);
     }
 
     // Accessibility Features Section (Enhanced)
@@ -494,15 +557,25 @@ function displayResults(data) {
             accessibilitySection.appendChild(scoreDiv);
         }
         
-        resultsDiv.appendChild(accessibilitySection);
+        target.appendChild(accessibilitySection);
     }
 
     // Auto-read if enabled
-    if (pdfState.preferences.autoRead && tts.enabled) {
+    if (target === resultsDiv && pdfState.preferences.autoRead && tts.enabled) {
         readCurrentPage();
     }
 }
 
+// Display one streamed page below the pages already shown
+function displayPageResults(page) {
+    const pageContainer = document.createElement('article');
+    pageContainer.className = 'page-results';
+    pageContainer.id = `page-results-${page.page}`;
+    pageContainer.setAttribute('aria-label', `${translate('Page')} ${page.page}`);
+    resultsDiv.appendChild(pageContainer);
+    displayResults(page, pageContainer, `page-${page.page}-`);
+}
+
 // Helper Functions
 // Show status message to user
 function showStatus(message) {
@@ -602,14 +675,26 @@ async function sendFileToServer(file) {
     formData.append('pdfFile', file);
     formData.append('language', pdfState.language);
     
+    // Ask for page-by-page results when the browser can read streams
+    const canStream = typeof ReadableStream !== 'undefined' && typeof TextDecoder !== 'undefined';
+    
     try {
         const response = await fetch('http://localhost:8000/parse-pdf', {
             method: 'POST',
+            // Otherwise prefer the compact layout; the browser negotiates compression.
+            // Streams also accept JSON, which the server sends for cached documents
+            headers: { 'Accept': canStream
+                ? `application/x-ndjson, ${COMPACT_MIMETYPE};q=0.9, application/json;q=0.8`
+                : `${COMPACT_MIMETYPE}, application/json;q=0.9` },
             body: formData
         });
         if (!response.ok) {
             throw new Error('Network response was not ok');
         }
+        if ((response.headers.get('Content-Type') || '').includes('application/x-ndjson')) {
+            await readResultStream(response);
+            return;
+        }
         const data = await response.json();
         if (data.status === 'success') {
             displayResults(data);
@@ -621,6 +706,51 @@ async function sendFileToServer(file) {
     }
 }
 
+// Read an NDJSON result stream and show each page as soon as it arrives
+async function readResultStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    const handleEvent = event => {
+        switch (event.type) {
+            case 'start':
+                resultsDiv.innerHTML = '';
+                break;
+            case 'page':
+                displayPageResults(event);
+                if (event.page === 1 && pdfState.preferences.autoRead && tts.enabled) {
+                    readCurrentPage();
+                }
+                break;
+            case 'done': {
+                // Document-wide accessibility summary goes after the pages
+                const summary = document.createElement('div');
+                summary.className = 'results-summary';
+                resultsDiv.appendChild(summary);
+                displayResults({ accessibility: event.accessibility }, summary, 'summary-');
+                break;
+            }
+            case 'error':
+                throw new Error(event.error || 'Processing failed');
+        }
+    };
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        // Every complete line is one event
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+    }
+    if (buffer.trim()) {
+        handleEvent(JSON.parse(buffer));
+    }
+}
+
 // PDF Rendering Functions
 // Load PDF document
 function loadPDF(data) {
@@ -0,0 +1,132 @@
+# Import required libraries
+import logging  # Logging facility
+import threading  # Waiting for budget to free up
+import time  # Admission deadlines
+from collections import namedtuple  # Cost estimates
+
+import psutil  # System memory
+
+logger = logging.getLogger(__name__)
+
+# Estimated peak memory in bytes and CPU time in seconds of one request
+Cost = namedtuple("Cost", ["memory", "seconds"])
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted within its wait time"""
+
+
+class Ticket:
+    """Budget held by one admitted request; release it when the work is done"""
+
+    def __init__(self, controller, cost: Cost):
+        self.controller = controller
+        self.cost = cost
+        self._released = False
+
+    def release(self):
+        """Return the budget; safe to call more than once"""
+        if not self._released:
+            self._released = True
+            self.controller._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class AdmissionController:
+    """
+    Keeps concurrent document processing within a memory and CPU budget
+    A request is admitted when its estimated memory fits both the budget left
+    by the requests already running and the memory actually available on the
+    machine, and, if it is heavy, when a heavy slot is free. Requests that do
+    not fit wait in arrival order until their deadline, then are rejected so
+    the client can retry instead of the machine swapping.
+    """
+
+    def __init__(self, memory_budget: int, memory_reserve: int, heavy_slots: int,
+                 heavy_seconds: float):
+        """
+        Args:
+            memory_budget: Bytes the admitted requests may use together
+            memory_reserve: Bytes of system memory that must stay available
+            heavy_slots: Maximum number of heavy requests running at once
+            heavy_seconds: Estimated CPU seconds from which a request is heavy
+        """
+        self.memory_budget = memory_budget
+        self.memory_reserve = memory_reserve
+        self.heavy_slots = heavy_slots
+        self.heavy_seconds = heavy_seconds
+        self._condition = threading.Condition()
+        self._tickets = []
+        self._waiting = []  # Waiters in arrival order
+        self.stats = {"admitted": 0, "rejected": 0}
+
+    def _is_heavy(self, cost: Cost) -> bool:
+        return cost.seconds >= self.heavy_seconds
+
+    def _fits(self, cost: Cost) -> bool:
+        """Whether cost can start now (condition lock must be held)"""
+        if not self._tickets:
+            # A request larger than the whole budget may still run alone
+            return psutil.virtual_memory().available >= self.memory_reserve
+        reserved = sum(ticket.cost.memory for ticket in self._tickets)
+        if reserved + cost.memory > self.memory_budget:
+            return False
+        if self._is_heavy(cost) and sum(
+                self._is_heavy(ticket.cost) for ticket in self._tickets) >= self.heavy_slots:
+            return False
+        return psutil.virtual_memory().available - cost.memory >= self.memory_reserve
+
+    def admit(self, cost: Cost, timeout: float) -> Ticket:
+        """
+        Wait until a request fits in the budget
+        Args:
+            cost: Estimated cost of the request
+            timeout: Maximum number of seconds to wait
+        Returns:
+            Ticket holding the budget until it is released
+        Raises:
+            AdmissionRejected: If the request did not fit within timeout
+        """
+        deadline = time.monotonic() + timeout
+        waiter = object()
+        with self._condition:
+            self._waiting.append(waiter)
+            try:
+                # Earlier arrivals go first, so small requests cannot starve big ones
+                while self._waiting[0] is not waiter or not self._fits(cost):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats["rejected"] += 1
+                        logger.warning(f"Rejected request needing {cost.memory / 1024 / 1024:.0f}MB, "
+                                       f"{cost.seconds:.0f}s; {len(self._tickets)} running")
+                        raise AdmissionRejected("The server is busy processing other documents, try again later")
+                    # Wake up periodically, system memory can free up without a release
+                    self._condition.wait(min(remaining, 1.0))
+                ticket = Ticket(self, cost)
+                self._tickets.append(ticket)
+                self.stats["admitted"] += 1
+                return ticket
+            finally:
+                self._waiting.remove(waiter)
+                self._condition.notify_all()
+
+    def _release(self, ticket: Ticket):
+        with self._condition:
+            self._tickets.remove(ticket)
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        """Current load, for the health endpoint"""
+        with self._condition:
+            return {
+                "running": len(self._tickets),
+                "heavy_running": sum(self._is_heavy(ticket.cost) for ticket in self._tickets),
+                "waiting": len(self._waiting),
+                "reserved_mb": round(sum(ticket.cost.memory for ticket in self._tickets) / 1024 / 1024, 1),
+                **self.stats
+            }
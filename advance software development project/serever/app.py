@@ -1,13 +1,26 @@
 # Import required libraries
-from flask import Flask, request, jsonify  # Flask web framework
+from flask import Flask, Response, request, jsonify  # Flask web framework
 from flask_cors import CORS  # Cross-Origin Resource Sharing
 import os  # Operating system interfaces
 import re  # Regular expressions
 import io  # Input/output operations
+import html  # Escaping text for accessibility markup
+import hashlib  # Page content hashing
+import json  # Streamed page serialization
+import mmap  # Memory-mapped large uploads
+import tempfile  # Anonymous spool files
 import logging  # Logging facility
+import threading  # Locking for shared counters
+import time  # Stage timing
 import traceback  # Stack trace printing
+import zipfile  # Archives of PDFs for batch processing
+from collections import OrderedDict  # Page layout LRU
+from contextlib import contextmanager  # Context manager helpers
+import multiprocessing  # Process start methods
+from concurrent.futures import ProcessPoolExecutor  # Page-parallel extraction
+from concurrent.futures.process import BrokenProcessPool  # Extraction workers that died
+from multiprocessing import resource_tracker, shared_memory  # PDF bytes shared with workers
 import psutil  # System monitoring
-from werkzeug.utils import secure_filename  # Secure filename handling
 import fitz  # PyMuPDF for PDF processing
 import pdfplumber  # PDF text extraction
 from PIL import Image  # Image processing
@@ -15,6 +28,14 @@ from transformers import BlipProcessor, BlipForConditionalGeneration  # Image ca
 import torch  # PyTorch for deep learning
 from transformers import pipeline  # NLP pipelines
 import latex2mathml.converter  # LaTeX to MathML conversion
+from result_cache import ResultCache  # Persistent response cache
+from translation import TranslationService, TranslationBatch  # Batched translation
+from persistent_cache import PersistentCache  # SQLite-backed caches
+from jobs import JobQueue, JobStore, QueueFullError  # Background processing jobs
+from model_registry import ModelRegistry  # Lazily loaded AI models
+from metrics import MetricsRegistry, collect_timings, record_stage, timed  # Prometheus metrics
+from admission import AdmissionController, AdmissionRejected, Cost  # Memory-aware backpressure
+from compact import COMPACT_MIMETYPE, available_encodings, compress, encode_result  # Compact responses
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,158 +43,1093 @@ logger = logging.getLogger(__name__)
 
 # Initialize Flask application
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = './uploads'  # Directory for uploaded files
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB file size limit
+app.config['UPLOAD_SPOOL_BYTES'] = 8 * 1024 * 1024  # Larger uploads are memory-mapped
 app.config['ALLOWED_EXTENSIONS'] = {'pdf'}  # Only allow PDF files
+app.config['RESULT_CACHE_DIR'] = './cache/results'  # Directory for cached responses
+app.config['RESULT_CACHE_MAX_BYTES'] = 512 * 1024 * 1024  # 512MB cache budget
+app.config['RESULT_CACHE_MAX_ENTRIES'] = 1000  # Maximum cached documents
+app.config['SERVER_WORKERS'] = int(os.environ.get('SERVER_WORKERS', 1))  # Worker processes sharing the machine, set by gunicorn.conf.py
+# Every worker forks its own extraction pool, so the cores are split between them
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get(
+    'EXTRACTION_WORKERS', max(1, (os.cpu_count() or 1) // app.config['SERVER_WORKERS'])))  # Page extraction processes in this worker
+app.config['PARALLEL_MIN_PAGES'] = 16  # Smaller documents are extracted in-process
+app.config['STREAM_BATCH_PAGES'] = 8  # Pages processed together after the first streamed page
+app.config['TABLE_FORCE_FULL_EXTRACTION'] = os.environ.get('TABLE_FORCE_FULL_EXTRACTION', '0') == '1'  # Skip the table pre-screen
+app.config['TRANSLATION_BATCH_SIZE'] = 16  # Strings per translation forward pass
+app.config['TRANSLATION_MAX_TOKENS'] = 0  # Tokens per text chunk, 0 derives it from the model
+app.config['TRANSLATION_MEMORY_PATH'] = './cache/translations.sqlite3'  # Translations shared across requests
+app.config['TRANSLATION_MEMORY_MAX_BYTES'] = 256 * 1024 * 1024  # Least recently used translations are evicted beyond this
+app.config['CAPTION_BATCH_SIZE'] = 8  # Images per captioning forward pass
+app.config['CAPTION_IMAGE_SIZE'] = 384  # BLIP input resolution; larger images are decoded reduced
+app.config['CAPTION_MIN_IMAGE_SIZE'] = 16  # Images with a smaller side are treated as decorative
+app.config['CAPTION_MIN_ENTROPY'] = 0.1  # Flatter images (bits per pixel) are treated as decorative
+app.config['CAPTION_CACHE_PATH'] = './cache/captions.sqlite3'  # Captions shared across requests
+app.config['CAPTION_CACHE_MAX_BYTES'] = 64 * 1024 * 1024  # Least recently used captions are evicted beyond this
+app.config['PAGE_CACHE_PATH'] = './cache/pages.sqlite3'  # Processed pages shared across documents
+app.config['PAGE_CACHE_MAX_BYTES'] = 1024 * 1024 * 1024  # Least recently used pages are evicted beyond this
+app.config['JOB_WORKERS'] = 2  # Documents processed concurrently
+app.config['JOB_QUEUE_SIZE'] = 32  # Maximum queued or running documents
+app.config['JOB_RETENTION_SECONDS'] = 3600  # How long finished results can be fetched
+app.config['JOB_MAX_FINISHED'] = 100  # Finished results kept for fetching, oldest dropped first
+app.config['JOB_STORE_PATH'] = './cache/jobs.sqlite3'  # Job status and results shared by all workers
+app.config['BATCH_WORKERS'] = 1  # Document batches processed concurrently
+app.config['BATCH_QUEUE_SIZE'] = 4  # Maximum queued or running batches
+app.config['BATCH_MAX_DOCUMENTS'] = 100  # PDFs accepted in one batch
+app.config['BATCH_MAX_BYTES'] = 512 * 1024 * 1024  # Total size of the PDFs in one batch, after unzipping
+# Each worker admits documents on its own, so the machine's budget is split between them
+app.config['ADMISSION_MEMORY_BUDGET'] = psutil.virtual_memory().total // 2 // app.config['SERVER_WORKERS']  # Estimated memory of the documents running in this worker
+app.config['ADMISSION_MEMORY_RESERVE'] = 512 * 1024 * 1024  # System memory that must stay available
+app.config['ADMISSION_HEAVY_SLOTS'] = max(1, (os.cpu_count() or 1) // 2 // app.config['SERVER_WORKERS'])  # Heavy documents processed at once in this worker
+app.config['ADMISSION_HEAVY_SECONDS'] = 30  # Estimated CPU seconds from which a document is heavy
+app.config['ADMISSION_WAIT_SECONDS'] = 20  # How long /parse-pdf waits for budget before a 503
+app.config['COST_PAGE_MEMORY'] = 2 * 1024 * 1024  # Estimated memory per page
+app.config['COST_IMAGE_MEMORY'] = 8 * 1024 * 1024  # Estimated memory per decoded image
+app.config['COST_PAGE_SECONDS'] = 0.05  # Estimated CPU time per page
+app.config['COST_IMAGE_SECONDS'] = 0.5  # Estimated CPU time per captioned image
+app.config['RESPONSE_COMPRESS_MIN_BYTES'] = 1024  # Smaller JSON responses are sent uncompressed
+app.config['WARM_MODELS'] = [name for name in os.environ.get('WARM_MODELS', '').split(',') if name]  # Models loaded at startup
+app.config['MODEL_WARMUP_BUDGET_SECONDS'] = 120  # Startup time allowed for warm-up
+app.config['INFERENCE_QUANTIZE'] = os.environ.get('INFERENCE_QUANTIZE', '0') == '1'  # Dynamic int8 Linear layers
+app.config['INFERENCE_THREADS'] = int(os.environ.get('INFERENCE_THREADS', 0))  # Torch threads per worker, 0 keeps the default
+app.config['INFERENCE_DECODING'] = os.environ.get('INFERENCE_DECODING', 'greedy')  # 'greedy' or 'beam'
+app.config['INFERENCE_NUM_BEAMS'] = 2  # Beam width for 'beam' decoding
 CORS(app)  # Enable CORS for all routes
 
-# Initialize AI models
-try:
-    # Image captioning model
-    processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-    model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base") 
-    
-    # Translation model
-    translator = pipeline("translation", model="Helsinki-NLP/opus-mt-mul-en")
-    
-    # Text processing model
-    text_processor = pipeline("text2text-generation", model="facebook/m2m100_418M")
-    
-    logger.info("AI models loaded successfully")
-except Exception as e:
-    logger.error(f"Model initialization failed: {str(e)}")
-    raise RuntimeError("Failed to initialize AI models") from e
+# Model identifiers, also part of the result cache key
+MODEL_VERSIONS = {
+    "captioning": "Salesforce/blip-image-captioning-base",
+    "translation": "Helsinki-NLP/opus-mt-mul-en",
+    "text": "facebook/m2m100_418M",
+    # Quantization and decoding change the outputs too
+    "inference": ("int8" if app.config['INFERENCE_QUANTIZE'] else "fp32") + "-" +
+                 ("beam%d" % app.config['INFERENCE_NUM_BEAMS']
+                  if app.config['INFERENCE_DECODING'] == 'beam' else "greedy")
+}
+
+def configure_torch_threads():
+    """Limit torch intra-op threads so workers do not contend for cores"""
+    if app.config['INFERENCE_THREADS'] > 0:
+        torch.set_num_threads(app.config['INFERENCE_THREADS'])
+
+def quantize_model(model):
+    """
+    Apply the CPU inference profile to a model
+    Args:
+        model: Torch model in fp32
+    Returns:
+        Model with dynamically int8-quantized Linear layers if
+        INFERENCE_QUANTIZE is set, otherwise the model unchanged
+    """
+    if not app.config['INFERENCE_QUANTIZE']:
+        return model
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def generation_kwargs() -> dict:
+    """Decoding settings shared by captioning and translation"""
+    if app.config['INFERENCE_DECODING'] == 'beam':
+        return {"num_beams": app.config['INFERENCE_NUM_BEAMS'], "early_stopping": True}
+    return {"num_beams": 1, "do_sample": False}
+
+configure_torch_threads()
+
+def load_captioning_model():
+    """Image captioning processor and model"""
+    processor = BlipProcessor.from_pretrained(MODEL_VERSIONS["captioning"])
+    # Safetensors weights are memory-mapped instead of copied into RAM
+    model = BlipForConditionalGeneration.from_pretrained(
+        MODEL_VERSIONS["captioning"], use_safetensors=True, low_cpu_mem_usage=True)
+    return processor, quantize_model(model.eval())
+
+def load_translator():
+    """Translation model"""
+    translator = pipeline("translation", model=MODEL_VERSIONS["translation"],
+                          model_kwargs={"low_cpu_mem_usage": True})
+    translator.model = quantize_model(translator.model.eval())
+    return translator
+
+def load_text_processor():
+    """Text processing model"""
+    text_processor = pipeline("text2text-generation", model=MODEL_VERSIONS["text"],
+                              model_kwargs={"low_cpu_mem_usage": True})
+    text_processor.model = quantize_model(text_processor.model.eval())
+    return text_processor
+
+# AI models, loaded on first use; English-only requests never load the translators
+models = ModelRegistry()
+models.register("captioning", load_captioning_model)
+models.register("translator", load_translator)
+models.register("text", load_text_processor)
+if app.config['WARM_MODELS']:
+    # Load before gunicorn forks so workers share the weights copy-on-write
+    models.warm_up(app.config['WARM_MODELS'], app.config['MODEL_WARMUP_BUDGET_SECONDS'])
+
+# Cache of final responses keyed by document hash, language and models
+result_cache = ResultCache(
+    app.config['RESULT_CACHE_DIR'],
+    max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+    max_entries=app.config['RESULT_CACHE_MAX_ENTRIES']
+)
+
+# Process pool for page-sharded extraction (see get_extraction_pool)
+extraction_pool = None
+
+# Pages checked by the table pre-screen and pages it kept away from pdfplumber
+table_screening = {"pages": 0, "skipped": 0}
+table_screening_lock = threading.Lock()
+
+# Translations of previously seen strings, keyed by source, language and model
+translation_memory = PersistentCache(app.config['TRANSLATION_MEMORY_PATH'], "translations",
+                                     max_bytes=app.config['TRANSLATION_MEMORY_MAX_BYTES'])
+
+# Per-process metrics exposed on /metrics
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    "pdf_stage_seconds", "Time spent in each processing stage")
+inference_batch_size = metrics.histogram(
+    "inference_batch_size", "Inputs per model forward pass", buckets=(1, 2, 4, 8, 16, 32, 64))
+pages_total = metrics.counter(
+    "pdf_pages_total", "Pages returned, by whether they were processed or cached")
+images_total = metrics.counter(
+    "pdf_images_total", "Distinct images described, by outcome")
+translated_strings_total = metrics.counter(
+    "translated_strings_total", "Strings run through a translation model")
+cache_requests_total = metrics.counter(
+    "cache_requests_total", "Cache lookups, by cache and result")
+table_screening_total = metrics.counter(
+    "table_prescreen_pages_total", "Pages checked by the table pre-screen, by outcome")
+admission_total = metrics.counter(
+    "admission_requests_total", "Documents admitted or rejected by the admission controller")
+
+def record_translation_batch(engine: str, batch_size: int, seconds: float):
+    """Metrics for one translation forward pass"""
+    record_stage(stage_seconds, "translation", seconds)
+    inference_batch_size.observe(batch_size, model=engine)
+    translated_strings_total.inc(batch_size, engine=engine)
+
+# Batched translation shared by all requests
+translation_service = TranslationService(
+    models.get,
+    batch_size=app.config['TRANSLATION_BATCH_SIZE'],
+    generate_kwargs=generation_kwargs(),
+    memory=translation_memory,
+    model_ids={
+        "translator": f"{MODEL_VERSIONS['translation']}/{MODEL_VERSIONS['inference']}",
+        "text": f"{MODEL_VERSIONS['text']}/{MODEL_VERSIONS['inference']}"
+    },
+    on_batch=record_translation_batch
+)
+
+# Captions of previously seen images, keyed by perceptual hash
+caption_cache = PersistentCache(app.config['CAPTION_CACHE_PATH'], "captions",
+                                max_bytes=app.config['CAPTION_CACHE_MAX_BYTES'])
+
+# Processed pages keyed by page content, language and models
+page_cache = PersistentCache(app.config['PAGE_CACHE_PATH'], "pages",
+                             max_bytes=app.config['PAGE_CACHE_MAX_BYTES'])
 
-# Create upload directory if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+# Keeps concurrent documents within the memory and CPU budget
+admission = AdmissionController(
+    memory_budget=app.config['ADMISSION_MEMORY_BUDGET'],
+    memory_reserve=app.config['ADMISSION_MEMORY_RESERVE'],
+    heavy_slots=app.config['ADMISSION_HEAVY_SLOTS'],
+    heavy_seconds=app.config['ADMISSION_HEAVY_SECONDS']
+)
 
 def allowed_file(filename):
     """Check if the file has an allowed extension"""
     return ('.' in filename and 
             filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS'])
 
-def extract_pdf_text(filepath: str, target_lang: str = "en") -> str:
+def parse_page_range(spec: str) -> list:
+    """
+    Parse a page range such as "40", "3-5", "10-" or "1,4-6"
+    Args:
+        spec: Comma-separated 1-based page numbers and inclusive ranges
+    Returns:
+        List of (first, last) pairs; last is None for an open-ended range
+    Raises:
+        ValueError: If the range is malformed
+    """
+    ranges = []
+    for part in spec.split(","):
+        first, dash, last = part.strip().partition("-")
+        try:
+            first = int(first)
+            last = int(last) if last.strip() else (None if dash else first)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {spec}")
+        if first < 1 or (last is not None and last < first):
+            raise ValueError(f"Invalid page range: {spec}")
+        ranges.append((first, last))
+    return ranges
+
+def select_pages(page_range, page_count: int) -> list:
+    """
+    Resolve a parsed page range against a document
+    Args:
+        page_range: Result of parse_page_range, or None for every page
+        page_count: Number of pages in the document
+    Returns:
+        Sorted zero-based page indexes
+    Raises:
+        ValueError: If no requested page exists in the document
+    """
+    if page_range is None:
+        return list(range(page_count))
+    selected = sorted({
+        page_num - 1
+        for first, last in page_range
+        for page_num in range(first, min(last or page_count, page_count) + 1)
+    })
+    if not selected:
+        raise ValueError(f"Requested pages are outside the document ({page_count} pages)")
+    return selected
+
+def estimate_cost(data, page_range: list = None) -> Cost:
+    """
+    Estimate the memory and CPU time a document needs from its page and image counts
+    Only the cross-reference table is read, no page is parsed.
+    Args:
+        data: PDF bytes
+        page_range: Optional result of parse_page_range
+    Returns:
+        Estimated cost; for unreadable files only the file size is counted
+    Raises:
+        ValueError: If no requested page exists in the document
+    """
+    # PyMuPDF and pdfplumber both keep parsed copies of the file
+    file_memory = 3 * len(data)
+    try:
+        doc = fitz.open(stream=data, filetype="pdf")
+    except Exception:
+        return Cost(file_memory, 0.0)
+    try:
+        page_count = len(doc)
+        # Distinct embedded images; images repeated across pages are described once
+        image_count = sum(1 for xref in range(1, doc.xref_length())
+                          if doc.xref_get_key(xref, "Subtype")[1] == "/Image")
+    finally:
+        doc.close()
+
+    pages = page_count
+    if page_range is not None:
+        pages = len(select_pages(page_range, page_count))
+        image_count = image_count * pages // max(page_count, 1)
+    # Images are decoded one caption batch at a time
+    decoded = min(image_count, app.config['CAPTION_BATCH_SIZE'])
+    return Cost(
+        memory=file_memory + pages * app.config['COST_PAGE_MEMORY'] +
+               decoded * app.config['COST_IMAGE_MEMORY'],
+        seconds=pages * app.config['COST_PAGE_SECONDS'] +
+                image_count * app.config['COST_IMAGE_SECONDS']
+    )
+
+class UploadedPDF:
+    """
+    An uploaded PDF held in memory, never written to a named file
+    Small uploads are kept as bytes. Larger ones are spooled to an anonymous
+    temporary file and memory-mapped, so the pages are read from the page
+    cache instead of being copied into the process heap.
+    """
+
+    def __init__(self, stream, spool_bytes: int):
+        """
+        Args:
+            stream: Readable binary stream of the upload
+            spool_bytes: Size above which the upload is memory-mapped
+        """
+        self._spool = None
+        self._mmap = None
+        head = stream.read(spool_bytes + 1)
+        if len(head) <= spool_bytes:
+            self.data = head
+            return
+
+        self._spool = tempfile.TemporaryFile()
+        self._spool.write(head)
+        del head
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            self._spool.write(chunk)
+        self._spool.flush()
+        self._mmap = mmap.mmap(self._spool.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self._mmap)
+
+    def __len__(self):
+        return len(self.data)
+
+    def reader(self):
+        """File-like view of the PDF that does not copy the data"""
+        if self._mmap is not None:
+            self._mmap.seek(0)
+            return self._mmap
+        return io.BytesIO(self.data)
+
+    def close(self):
+        """Release the memory map and the spool file"""
+        if self._mmap is None:
+            return
+        try:
+            self.data.release()
+            self._mmap.close()
+        except BufferError:
+            # A parser still holds a view; the map is freed with it
+            pass
+        self._spool.close()
+        self._mmap = None
+
+# An indirect reference such as "12 0 R" in a PDF object definition
+OBJECT_REFERENCE = re.compile(r"\b(\d+) \d+ R\b")
+
+class DocumentContext:
+    """
+    A PDF opened once per request and shared by all extractors
+    PyMuPDF parses the file a single time; pdfplumber is only opened when
+    tables are requested. Each page's text layout is computed once and reused
+    for both the accessible markup and formula detection. Only the layouts
+    of the most recently used pages are kept, so memory does not grow with
+    the page count.
+    """
+
+    def __init__(self, source, max_page_dicts: int = 1):
+        """
+        Args:
+            source: UploadedPDF, PDF bytes, or path to the PDF file
+            max_page_dicts: Number of page text layouts kept; pages are
+                processed one after the other, so one is enough
+        Raises:
+            ValueError: If the PDF is password protected
+        """
+        self.source = source
+        if isinstance(source, str):
+            self.data = None
+            self.doc = fitz.open(source)
+        else:
+            self.data = source.data if isinstance(source, UploadedPDF) else source
+            self.doc = fitz.open(stream=self.data, filetype="pdf")
+        # Encrypted files open, but none of their pages can be loaded
+        if self.doc.needs_pass or self.doc.is_encrypted:
+            self.doc.close()
+            raise ValueError("PDF is password protected")
+        self._plumber = None  # Opened lazily for table extraction
+        self.max_page_dicts = max_page_dicts
+        self._page_dicts = OrderedDict()  # page index -> get_text("dict") result, oldest first
+        self._object_digests = {}  # xref -> object_digest() result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.doc)
+
+    @property
+    def plumber(self):
+        """pdfplumber view of the same file, opened on first use"""
+        if self._plumber is None:
+            if isinstance(self.source, UploadedPDF):
+                self._plumber = pdfplumber.open(self.source.reader())
+            elif self.data is not None:
+                self._plumber = pdfplumber.open(io.BytesIO(self.data))
+            else:
+                self._plumber = pdfplumber.open(self.source)
+        return self._plumber
+
+    def page_dict(self, page_num: int) -> dict:
+        """
+        Structured text of a page, kept for the most recently used pages
+        Args:
+            page_num: Zero-based page index
+        Returns:
+            PyMuPDF text dictionary with blocks, lines and spans
+        """
+        if page_num in self._page_dicts:
+            self._page_dicts.move_to_end(page_num)
+            return self._page_dicts[page_num]
+        page = self.doc.load_page(page_num)
+        self._page_dicts[page_num] = page.get_text("dict", flags=fitz.TEXT_PRESERVE_IMAGES)
+        while len(self._page_dicts) > self.max_page_dicts:
+            self._page_dicts.popitem(last=False)
+        return self._page_dicts[page_num]
+
+    def page_text(self, page_num: int) -> str:
+        """
+        Plain text of a page, derived from the cached text dictionary
+        Args:
+            page_num: Zero-based page index
+        Returns:
+            Page text with one line per text line
+        """
+        lines = []
+        for block in self.page_dict(page_num).get("blocks", []):
+            if block["type"] == 0:
+                for line in block["lines"]:
+                    lines.append("".join(span["text"] for span in line["spans"]))
+        return "\n".join(lines)
+
+    def object_digest(self, xref: int) -> bytes:
+        """
+        Digest of a PDF object and every object it refers to, computed once
+        Object numbers are left out, so the same font embedded in another
+        document digests the same.
+        Args:
+            xref: Cross-reference number of the object
+        Returns:
+            SHA-256 digest of the object definitions and raw stream contents
+        """
+        if xref not in self._object_digests:
+            digest = hashlib.sha256()
+            pending = [xref]
+            seen = set()
+            while pending:
+                current = pending.pop()
+                if current in seen or not 0 < current < self.doc.xref_length():
+                    continue
+                seen.add(current)
+                source = self.doc.xref_object(current, compressed=True)
+                digest.update(OBJECT_REFERENCE.sub("R", source).encode("utf-8"))
+                if self.doc.xref_is_stream(current):
+                    digest.update(hashlib.sha256(self.doc.xref_stream_raw(current) or b"").digest())
+                # Reversed so the referenced objects are visited in order
+                pending.extend(int(ref) for ref in reversed(OBJECT_REFERENCE.findall(source)))
+            self._object_digests[xref] = digest.digest()
+        return self._object_digests[xref]
+
+    def close(self):
+        """Release both parsers"""
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self.doc.close()
+        self._page_dicts.clear()
+        self._object_digests.clear()
+
+@contextmanager
+def open_document(source):
+    """
+    Reuse a shared DocumentContext or open a private one for a file path
+    Args:
+        source: DocumentContext or path to the PDF file
+    """
+    if isinstance(source, DocumentContext):
+        yield source
+    else:
+        with DocumentContext(source) as doc:
+            yield doc
+
+def page_markup(text_page: dict) -> str:
+    """
+    Build the accessible markup for one page
+    Fragments are collected in a list and joined once, so the cost is linear
+    in the page size. Span text is HTML-escaped once and reused for both the
+    aria-label and the content.
+    Args:
+        text_page: PyMuPDF text dictionary of the page
+    Returns:
+        Page text with accessibility markup
+    """
+    parts = []
+    for block in text_page.get("blocks", []):
+        if block["type"] == 0:  # Text block
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    # Add accessibility attributes to text spans
+                    text = html.escape(span["text"])
+                    parts.append(f'<span role="text" aria-label="{text}">{text}</span>')
+                parts.append("\n")
+        elif block["type"] == 1:  # Image block
+            parts.append(f'[Image: {html.escape(block.get("alt", "No description"))}]')
+    return "".join(parts)
+
+def iter_text_fragments(source):
+    """
+    Yield the accessible markup of a document one page at a time
+    Args:
+        source: DocumentContext or path to the PDF file
+    Yields:
+        Markup of each page, in page order
+    """
+    with open_document(source) as doc:
+        for page_num in range(len(doc)):
+            yield page_markup(doc.page_dict(page_num))
+
+def page_may_have_tables(page) -> bool:
+    """
+    Cheap pre-screen for pages that may contain tables
+    pdfplumber's default table settings build cells only from ruling lines
+    and rectangle edges, so extract_tables() cannot find a table on a page
+    without at least two horizontal and two vertical rulings. The rulings are
+    counted from PyMuPDF's drawing list, which is far cheaper than the
+    pdfplumber layout analysis.
+    Args:
+        page: PyMuPDF page
+    Returns:
+        True if the page needs full table extraction
+    """
+    if app.config['TABLE_FORCE_FULL_EXTRACTION']:
+        return True
+    min_length = 3  # pdfplumber's default edge_min_length
+    horizontal = vertical = 0
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            if item[0] == "l":
+                start, end = item[1], item[2]
+                if abs(start.y - end.y) < 1 and abs(start.x - end.x) >= min_length:
+                    horizontal += 1
+                elif abs(start.x - end.x) < 1 and abs(start.y - end.y) >= min_length:
+                    vertical += 1
+            elif item[0] in ("re", "qu"):
+                rect = item[1].rect if item[0] == "qu" else item[1]
+                if rect.width >= min_length:
+                    horizontal += 2
+                if rect.height >= min_length:
+                    vertical += 2
+            if horizontal >= 2 and vertical >= 2:
+                return True
+    return False
+
+def record_table_screening(pages: int, skipped: int):
+    """Add to the table pre-screen counters reported by /health"""
+    with table_screening_lock:
+        table_screening["pages"] += pages
+        table_screening["skipped"] += skipped
+
+def page_tables(page, page_num: int) -> list:
+    """
+    Extract the tables of one pdfplumber page, untranslated
+    Args:
+        page: pdfplumber page
+        page_num: Zero-based page index
+    Returns:
+        List of tables with accessibility information
+    """
+    tables = []
+    for table_num, table in enumerate(page.extract_tables()):
+        tables.append({
+            "page": page_num + 1,
+            "table_num": table_num + 1,
+            "rows": table,
+            "summary": f"Table {table_num + 1} with {len(table)} rows",
+            "role": "table",
+            "accessibility": {
+                "headers": table[0] if len(table) > 0 else [],
+                "row_count": len(table),
+                "col_count": len(table[0]) if len(table) > 0 else 0
+            }
+        })
+    return tables
+
+def page_formulas(text: str, page_num: int) -> list:
+    """
+    Find LaTeX formulas in the text of one page, untranslated
+    Args:
+        text: Plain text of the page
+        page_num: Zero-based page index
+    Returns:
+        List of formulas with MathML and descriptions
+    """
+    formulas = []
+    # Find LaTeX formulas between $ symbols
+    for match in re.finditer(r'\$(.*?)\$', text):
+        try:
+            latex = match.group(1)
+            # Convert LaTeX to MathML
+            mathml = latex2mathml.converter.convert(latex)
+            description = f"Mathematical formula: {latex}"
+            formulas.append({
+                "page": page_num + 1,
+                "latex": latex,
+                "mathml": mathml,
+                "description": description,
+                "role": "math",
+                "aria-label": description
+            })
+        except Exception as e:
+            logger.warning(f"Formula conversion failed: {str(e)}")
+            continue
+    return formulas
+
+def page_content_hash(doc: DocumentContext, page_num: int) -> str:
+    """
+    Hash everything that determines the processed result of a page
+    Covers the page size, its content stream, the fonts it uses with their
+    encodings, ToUnicode maps and font files, and the raw streams of its
+    images and form XObjects, so an unchanged page of a revised document
+    hashes the same as before.
+    Args:
+        doc: Shared document context
+        page_num: Zero-based page index
+    Returns:
+        Hex digest of the page content
+    """
+    page = doc.doc.load_page(page_num)
+    digest = hashlib.sha256(repr(tuple(page.rect)).encode("utf-8"))
+    digest.update(page.read_contents())
+    for font in page.get_fonts(full=True):
+        digest.update(f"\0{font[4]}".encode("utf-8"))  # Resource name used by the content stream
+        # The encoding and ToUnicode map decide which text is extracted
+        digest.update(doc.object_digest(font[0]))
+    xrefs = [img[0] for img in page.get_images(full=True)]
+    xrefs += [xobject[0] for xobject in page.get_xobjects()]
+    for xref in xrefs:
+        digest.update(hashlib.sha256(doc.doc.xref_stream_raw(xref) or b"").digest())
+    return digest.hexdigest()
+
+def page_cache_key(doc: DocumentContext, page_num: int, target_lang: str) -> str:
+    """Page cache key of a page, target language and models"""
+    return ResultCache.make_key(
+        page_content_hash(doc, page_num).encode("ascii"), target_lang, MODEL_VERSIONS)
+
+def place_page(page: dict, page_num: int) -> dict:
+    """
+    Copy of a cached page result numbered for its position in this document
+    Args:
+        page: Simplified page content
+        page_num: Zero-based page index
+    """
+    number = page_num + 1
+    return {
+        **page,
+        "page": number,
+        "formulas": [{**formula, "page": number} for formula in page["formulas"]],
+        "images": [{**img, "page": number} for img in page["images"]]
+    }
+
+def queue_text_translation(batch: TranslationBatch, text_content: str) -> list:
+    """
+    Queue extracted text markup for translation
+    Args:
+        batch: Translation batch of the request
+        text_content: Text with accessibility markup
+    Returns:
+        List of chunks; join it with "" after batch.run()
+    """
+    if batch.target_lang == "en":
+        return [text_content]
+    # Pack whole sentences into chunks that fit the model's token limit
+    chunks = translation_service.chunk_text(
+        text_content, max_tokens=app.config['TRANSLATION_MAX_TOKENS'])
+    for index, chunk in enumerate(chunks):
+        # Keep the whitespace between chunks out of the model input
+        stripped = chunk.strip()
+        if stripped:
+            start = chunk.index(stripped)
+            template = chunk[:start] + "{}" + chunk[start + len(stripped):]
+            batch.add(chunks, index, stripped, engine="text", template=template)
+    return chunks
+
+def queue_table_translation(batch: TranslationBatch, table_data: dict) -> dict:
+    """Queue table summary and headers for translation"""
+    batch.add(table_data, "summary")
+    headers = table_data["accessibility"]["headers"]
+    if headers:
+        # Translate a copy, the header row is also the first entry of rows
+        headers = table_data["accessibility"]["headers"] = list(headers)
+        for index in range(len(headers)):
+            batch.add(headers, index)
+    return table_data
+
+def queue_formula_translation(batch: TranslationBatch, formula: dict) -> dict:
+    """Queue a formula description for translation"""
+    batch.add(formula, "description")
+    batch.add(formula, "aria-label", formula["description"])
+    return formula
+
+def queue_image_translation(batch: TranslationBatch, image_data: dict) -> dict:
+    """Queue an image caption and its aria-label for translation"""
+    caption = image_data["alt_text"]
+    batch.add(image_data, "alt_text")
+    if image_data["aria-label"] == f"Image described as: {caption}":
+        batch.add(image_data, "aria-label", caption, template="Image described as: {}")
+    else:
+        batch.add(image_data, "aria-label")
+    return image_data
+
+def extract_page_range(shm_name: str, size: int, page_numbers: list) -> list:
+    """
+    Extract text, tables and formulas for a shard of pages
+    Runs inside extraction worker processes, so it opens its own copy of the
+    document and never touches the AI models.
+    Args:
+        shm_name: Shared memory block holding the PDF bytes
+        size: Length of the PDF in bytes
+        page_numbers: Zero-based page indexes, in order
+    Returns:
+        One untranslated result dictionary per page, in page order
+    """
+    # Workers are forked after the parent started its resource tracker (see
+    # get_extraction_pool), so attaching registers the block with the
+    # parent's tracker, which only unlinks what the parent leaks
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    with DocumentContext(data) as doc:
+        return [extract_page(doc, page_num) for page_num in page_numbers]
+
+def extract_page(doc: DocumentContext, page_num: int) -> dict:
+    """
+    Extract text, tables and formulas of a single page, untranslated
+    Args:
+        doc: Shared document context
+        page_num: Zero-based page index
+    Returns:
+        Dictionary with the page number, markup, tables and formulas, whether
+        the table pre-screen skipped the page, and the time of each stage
+    """
+    start = time.perf_counter()
+    tables = []
+    tables_skipped = not page_may_have_tables(doc.doc.load_page(page_num))
+    if not tables_skipped:
+        plumber_page = doc.plumber.pages[page_num]
+        tables = page_tables(plumber_page, page_num)
+        # Drop the cached layout objects before moving on
+        plumber_page.close()
+    text_start = time.perf_counter()
+    text = page_markup(doc.page_dict(page_num))
+    formulas_start = time.perf_counter()
+    formulas = page_formulas(doc.page_text(page_num), page_num)
+    return {
+        "page": page_num + 1,
+        "text": text,
+        "tables": tables,
+        "formulas": formulas,
+        "tables_skipped": tables_skipped,
+        "timings": {
+            "tables": text_start - start,
+            "text": formulas_start - text_start,
+            "formulas": time.perf_counter() - formulas_start
+        }
+    }
+
+def get_extraction_pool():
+    """
+    Bounded process pool for page-sharded extraction
+    gunicorn creates it when a worker starts (see gunicorn.conf.py), before
+    the worker runs any other thread; otherwise it is created on first use,
+    or again after its processes died.
+    """
+    global extraction_pool
+    if extraction_pool is None:
+        # Start the resource tracker before forking so the workers share it;
+        # a tracker of their own would unlink the shared PDF when one dies
+        resource_tracker.ensure_running()
+        # Fork so workers do not re-import this module and reload the models
+        extraction_pool = ProcessPoolExecutor(
+            max_workers=app.config['EXTRACTION_WORKERS'],
+            mp_context=multiprocessing.get_context("fork")
+        )
+        # With fork, the first task starts every worker process at once
+        extraction_pool.submit(os.getpid).result()
+    return extraction_pool
+
+def extract_pages(doc: DocumentContext, page_numbers: list = None) -> list:
+    """
+    Extract text, tables and formulas for the pages of a document
+    Many pages are split into shards that run in parallel in the extraction
+    process pool; results are merged back in page order.
+    Args:
+        doc: Shared document context
+        page_numbers: Zero-based page indexes in order (default: every page)
+    Returns:
+        One untranslated result dictionary per page, in page order
+    """
+    if page_numbers is None:
+        page_numbers = list(range(len(doc)))
+    # Pages run in parallel, so the request's timings get the wall time
+    with timed(stage_seconds, "extraction"):
+        if (app.config['EXTRACTION_WORKERS'] <= 1 or
+                len(page_numbers) < app.config['PARALLEL_MIN_PAGES']):
+            pages = [extract_page(doc, page_num) for page_num in page_numbers]
+        else:
+            pages = extract_pages_parallel(doc, page_numbers)
+    # Workers cannot update this process's counters, so count here
+    record_table_screening(len(pages), sum(page["tables_skipped"] for page in pages))
+    for page in pages:
+        # Per-page stage durations only go to the histogram
+        for stage, seconds in page.pop("timings").items():
+            stage_seconds.observe(seconds, stage=stage)
+    return pages
+
+def extract_pages_parallel(doc: DocumentContext, page_numbers: list) -> list:
+    """Extract pages in the process pool, one contiguous range of pages per worker"""
+    global extraction_pool
+    # Every task copies and parses the whole PDF, so each worker gets one
+    shard_size = -(-len(page_numbers) // app.config['EXTRACTION_WORKERS'])
+    shards = [page_numbers[start:start + shard_size]
+              for start in range(0, len(page_numbers), shard_size)]
+
+    # Hand the PDF to the workers once through shared memory, not per shard
+    data = doc.data if doc.data is not None else doc.doc.tobytes()
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        pool = get_extraction_pool()
+        results = pool.map(
+            extract_page_range, [shm.name] * len(shards), [len(data)] * len(shards), shards)
+        return [page for shard in results for page in shard]
+    except BrokenProcessPool:
+        # A worker was killed, e.g. by the OOM killer, and the pool is unusable;
+        # the next document gets a new one
+        logger.warning("Extraction worker died, extracting this document in-process")
+        if extraction_pool is pool:
+            extraction_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        return [extract_page(doc, page_num) for page_num in page_numbers]
+    finally:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            # Already unlinked by a resource tracker; the result does not depend on it
+            pass
+
+def extract_pdf_text(source, target_lang: str = "en") -> str:
     """
     Extract text content from PDF with accessibility tags
     Args:
-        filepath: Path to the PDF file
+        source: DocumentContext or path to the PDF file
         target_lang: Target language for translation (default: English)
     Returns:
         Extracted text with accessibility markup
     """
     try:
-        text_content = ""
-        with fitz.open(filepath) as doc:
-            for page in doc:
-                # Get text with structure preservation
-                text_page = page.get_text("dict", flags=fitz.TEXT_PRESERVE_IMAGES)
-                for block in text_page.get("blocks", []):
-                    if block["type"] == 0:  # Text block
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                # Add accessibility attributes to text spans
-                                text_content += f'<span role="text" aria-label="{span["text"]}">{span["text"]}</span>'
-                            text_content += "\n"
-                    elif block["type"] == 1:  # Image block
-                        text_content += f'[Image: {block.get("alt", "No description")}]'
+        # Get text with structure preservation
+        text_content = "".join(iter_text_fragments(source))
         
         # Translate text if target language isn't English
-        if target_lang != "en":
-            # Split text into chunks for translation (500 chars each)
-            chunks = [text_content[i:i+500] for i in range(0, len(text_content), 500)]
-            translated_chunks = []
-            for chunk in chunks:
-                translated = text_processor(chunk, forced_bos_token_id=text_processor.lang_code_to_id[target_lang])
-                translated_chunks.append(translated[0]['generated_text'])
-            return " ".join(translated_chunks)
-        
-        return text_content
+        batch = TranslationBatch(translation_service, target_lang)
+        chunks = queue_text_translation(batch, text_content)
+        batch.run()
+        return "".join(chunks)
     except Exception as e:
         raise Exception(f"Text extraction failed: {str(e)}")
 
-def extract_pdf_tables(filepath: str, target_lang: str = "en") -> list:
+def extract_pdf_tables(source, target_lang: str = "en") -> list:
     """
     Extract tables from PDF with accessibility metadata
     Args:
-        filepath: Path to the PDF file
+        source: DocumentContext or path to the PDF file
         target_lang: Target language for translation
     Returns:
         List of tables with accessibility information
     """
     try:
         tables = []
-        with pdfplumber.open(filepath) as pdf:
-            for page_num, page in enumerate(pdf.pages):
+        batch = TranslationBatch(translation_service, target_lang)
+        with open_document(source) as doc:
+            skipped = 0
+            for page_num, page in enumerate(doc.plumber.pages):
+                # Leave pages without rulings to the cheap pre-screen
+                if not page_may_have_tables(doc.doc.load_page(page_num)):
+                    skipped += 1
+                    continue
                 # Extract all tables from the page
-                for table_num, table in enumerate(page.extract_tables()):
-                    table_data = {
-                        "page": page_num + 1,
-                        "table_num": table_num + 1,
-                        "rows": table,
-                        "summary": f"Table {table_num + 1} with {len(table)} rows",
-                        "role": "table",
-                        "accessibility": {
-                            "headers": table[0] if len(table) > 0 else [],
-                            "row_count": len(table),
-                            "col_count": len(table[0]) if len(table) > 0 else 0
-                        }
-                    }
-                    
+                for table_data in page_tables(page, page_num):
                     # Translate table metadata if needed
-                    if target_lang != "en":
-                        table_data["summary"] = translator(table_data["summary"], target_lang=target_lang)[0]['translation_text']
-                        if table_data["accessibility"]["headers"]:
-                            table_data["accessibility"]["headers"] = [
-                                translator(h, target_lang=target_lang)[0]['translation_text'] 
-                                for h in table_data["accessibility"]["headers"]
-                            ]
-                    
-                    tables.append(table_data)
+                    tables.append(queue_table_translation(batch, table_data))
+                # Drop the cached layout objects before moving on
+                page.close()
+            record_table_screening(len(doc), skipped)
+        batch.run()
         return tables
     except Exception as e:
         raise Exception(f"Table extraction failed: {str(e)}")
 
-def extract_formulas(filepath: str, target_lang: str = "en") -> list:
+def extract_formulas(source, target_lang: str = "en") -> list:
     """
     Extract mathematical formulas from PDF
     Args:
-        filepath: Path to the PDF file
+        source: DocumentContext or path to the PDF file
         target_lang: Target language for description
     Returns:
         List of formulas with MathML and descriptions
     """
     try:
         formulas = []
-        with pdfplumber.open(filepath) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                text = page.extract_text()
-                # Find LaTeX formulas between $ symbols
-                for match in re.finditer(r'\$(.*?)\$', text):
-                    try:
-                        latex = match.group(1)
-                        # Convert LaTeX to MathML
-                        mathml = latex2mathml.converter.convert(latex)
-                        description = f"Mathematical formula: {latex}"
-                        
-                        # Translate description if needed
-                        if target_lang != "en":
-                            description = translator(description, target_lang=target_lang)[0]['translation_text']
-                        
-                        formulas.append({
-                            "page": page_num + 1,
-                            "latex": latex,
-                            "mathml": mathml,
-                            "description": description,
-                            "role": "math",
-                            "aria-label": description
-                        })
-                    except Exception as e:
-                        logger.warning(f"Formula conversion failed: {str(e)}")
-                        continue
+        batch = TranslationBatch(translation_service, target_lang)
+        with open_document(source) as doc:
+            for page_num in range(len(doc)):
+                # Reuse the text layout already computed for the page
+                for formula in page_formulas(doc.page_text(page_num), page_num):
+                    # Translate description if needed
+                    formulas.append(queue_formula_translation(batch, formula))
+        batch.run()
         return formulas
     except Exception as e:
         raise Exception(f"Formula extraction failed: {str(e)}")
 
+def default_image_description() -> dict:
+    """Description used when an image cannot be decoded or captioned"""
+    return {
+        "basic_description": "Image",
+        "width": 0,
+        "height": 0,
+        "role": "graphic",
+        "aria-label": "Image without description"
+    }
+
+def decorative_image_description(width: int, height: int) -> dict:
+    """Description of a spacer, rule or flat image that is not captioned"""
+    return {
+        "basic_description": "Decorative image",
+        "width": width,
+        "height": height,
+        "role": "presentation",
+        "aria-label": "Decorative image"
+    }
+
+def prepare_image(image_bytes: bytes):
+    """
+    Decode an image for captioning at no more than the resolution BLIP uses
+    Tiny images are rejected from the header alone. JPEGs are decoded
+    directly at a reduced scale with draft(); other large images are shrunk
+    with reduce() right after decoding. Images whose grayscale entropy is
+    below CAPTION_MIN_ENTROPY (blank or single-colour) are rejected too.
+    Args:
+        image_bytes: Binary image data
+    Returns:
+        Tuple of the RGB image, or None if the image is decorative, and the
+        original (width, height)
+    """
+    image = Image.open(io.BytesIO(image_bytes))  # Reads the header only
+    size = image.size
+    min_size = app.config['CAPTION_MIN_IMAGE_SIZE']
+    if min(size) < min_size:
+        return None, size
+
+    target = app.config['CAPTION_IMAGE_SIZE']
+    # JPEG decoders can scale by 1/2, 1/4 or 1/8 while decoding
+    image.draft("RGB", (target, target))
+    factor = min(image.size) // target
+    if factor > 1:
+        # reduce() does not support palette, bilevel or 16-bit images
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        image = image.reduce(factor)
+    image = image.convert("RGB")
+    if image.convert("L").entropy() < app.config['CAPTION_MIN_ENTROPY']:
+        return None, size
+    return image, size
+
+def caption_images(images: list) -> list:
+    """
+    Caption decoded images with BLIP, several images per forward pass
+    Args:
+        images: List of RGB PIL images
+    Returns:
+        One caption per image, None where captioning failed
+    """
+    captions = []
+    if not images:
+        return captions
+    processor, model = models.get("captioning")
+    batch_size = app.config['CAPTION_BATCH_SIZE']
+    for start in range(0, len(images), batch_size):
+        chunk = images[start:start + batch_size]
+        try:
+            with timed(stage_seconds, "captioning"):
+                inputs = processor(images=chunk, return_tensors="pt")
+                with torch.inference_mode():
+                    caption_ids = model.generate(**inputs, **generation_kwargs())
+                captions.extend(processor.batch_decode(caption_ids, skip_special_tokens=True))
+            inference_batch_size.observe(len(chunk), model="captioning")
+        except Exception as e:
+            logger.error(f"Image captioning failed: {str(e)}")
+            captions.extend([None] * len(chunk))
+    return captions
+
+def image_hash(image) -> str:
+    """
+    Perceptual hash of an image
+    Combines a 64-bit difference hash with the coarse average colour and
+    aspect ratio, so re-encoded or rescaled copies of a logo share a hash
+    while flat images of different colours do not.
+    Args:
+        image: RGB PIL image
+    Returns:
+        Hex string identifying the image content
+    """
+    small = image.convert("L").resize((9, 8), Image.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    red, green, blue = (channel // 32 for channel in image.resize((1, 1), Image.BOX).getpixel((0, 0)))
+    aspect = round(image.width / max(image.height, 1), 1)
+    return f"{bits:016x}-{red}{green}{blue}-{aspect}"
+
+def describe_images(images_bytes: list) -> list:
+    """
+    Generate English accessible descriptions for many images
+    Images are decoded and captioned one caption batch at a time, so at most
+    CAPTION_BATCH_SIZE decoded images are held in memory. Decorative images
+    are skipped (see prepare_image) and captions are looked up by perceptual
+    hash first; only unseen images reach the model.
+    Args:
+        images_bytes: List of binary image data
+    Returns:
+        One description dictionary per image, in input order
+    """
+    descriptions = []
+    batch_size = app.config['CAPTION_BATCH_SIZE']
+    for start in range(0, len(images_bytes), batch_size):
+        decoded = []
+        keys = []
+        sizes = []
+        for image_bytes in images_bytes[start:start + batch_size]:
+            try:
+                # Open and convert image, reduced to the captioning resolution
+                image, size = prepare_image(image_bytes)
+                decoded.append(image)
+                sizes.append(size)
+                keys.append(f"{MODEL_VERSIONS['captioning']}/{MODEL_VERSIONS['inference']}:{image_hash(image)}"
+                            if image is not None else None)
+            except Exception as e:
+                logger.error(f"Image decoding failed: {str(e)}")
+                decoded.append(None)
+                sizes.append(None)
+                keys.append(None)
+
+        # Caption each unseen image once, even if it repeats within the batch
+        known = caption_cache.get_many([key for key in keys if key])
+        unseen = {}
+        for image, key in zip(decoded, keys):
+            if key and key not in known and key not in unseen:
+                unseen[key] = image
+        new_captions = {
+            key: caption
+            for key, caption in zip(unseen, caption_images(list(unseen.values())))
+            if caption is not None
+        }
+        caption_cache.set_many(new_captions)
+        known.update(new_captions)
+
+        for image, key, size in zip(decoded, keys, sizes):
+            if image is None and size is not None:
+                images_total.inc(outcome="decorative")
+                descriptions.append(decorative_image_description(*size))
+                continue
+            caption = known.get(key)
+            if caption is None:
+                # Use default values if captioning fails
+                images_total.inc(outcome="failed")
+                descriptions.append(default_image_description())
+                continue
+            images_total.inc(outcome="captioned" if key in new_captions else "cached")
+            descriptions.append({
+                "basic_description": caption,
+                "width": size[0],
+                "height": size[1],
+                "role": "graphic",
+                "aria-label": f"Image described as: {caption}"
+            })
+    return descriptions
+
 def generate_image_caption(image_bytes: bytes, target_lang: str = "en") -> dict:
     """
     Generate accessible descriptions for images
@@ -183,77 +1139,255 @@ def generate_image_caption(image_bytes: bytes, target_lang: str = "en") -> dict:
     Returns:
         Dictionary with image description and metadata
     """
-    try:
-        # Open and convert image
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        
-        # Generate caption using BLIP model
-        inputs = processor(image, return_tensors="pt")
-        with torch.no_grad():
-            caption_ids = model.generate(**inputs)
-        caption = processor.decode(caption_ids[0], skip_special_tokens=True)
-        
-        # Translate caption if needed
-        if target_lang != "en":
-            caption = translator(caption, target_lang=target_lang)[0]['translation_text']
-        
-        return {
-            "basic_description": caption,
-            "width": image.width,
-            "height": image.height,
-            "role": "graphic",
-            "aria-label": f"Image described as: {caption}"
-        }
-    except Exception as e:
-        logger.error(f"Image captioning failed: {str(e)}")
-        # Return default values if captioning fails
-        return {
-            "basic_description": "Image",
-            "width": 0,
-            "height": 0,
-            "role": "graphic",
-            "aria-label": "Image without description"
-        }
+    descriptions = describe_images([image_bytes])[0]
+    if not descriptions["width"]:
+        return descriptions
+    
+    # Translate caption if needed
+    caption = descriptions["basic_description"]
+    batch = TranslationBatch(translation_service, target_lang)
+    batch.add(descriptions, "basic_description")
+    if descriptions["aria-label"] == f"Image described as: {caption}":
+        batch.add(descriptions, "aria-label", caption, template="Image described as: {}")
+    else:
+        batch.add(descriptions, "aria-label")
+    batch.run()
+    return descriptions
 
-def extract_pdf_images(filepath: str, target_lang: str = "en") -> list:
+def page_images(doc: DocumentContext, page_numbers, batch: TranslationBatch,
+                described: dict = None) -> list:
     """
-    Extract images from PDF with accessibility data
+    Extract and describe the images on some pages of a document
     Args:
-        filepath: Path to the PDF file
-        target_lang: Target language for descriptions
+        doc: Shared document context
+        page_numbers: Zero-based page indexes, in order
+        batch: Translation batch the captions are queued on
+        described: Optional xref -> description mapping reused across calls,
+            so images repeated on later pages are not described again
     Returns:
         List of images with metadata and descriptions
     """
-    images_data = []
-    try:
-        doc = fitz.open(filepath)
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
+    described = {} if described is None else described
+    found, new_xrefs, images_bytes = collect_images(doc, page_numbers, described)
+    # Generate descriptions for all new images in batches
+    described.update(zip(new_xrefs, describe_images(images_bytes)))
+    return image_records(found, described, batch)
+
+def collect_images(doc: DocumentContext, page_numbers, described: dict) -> tuple:
+    """
+    Pull every image not yet described out of some pages
+    Args:
+        doc: Shared document context
+        page_numbers: Zero-based page indexes, in order
+        described: xref -> description mapping of images already described
+    Returns:
+        Tuple of the (page index, image index, xref) of every image found,
+        the xrefs of the new images and their binary data
+    """
+    found = []
+    new_xrefs = []
+    images_bytes = []
+    with timed(stage_seconds, "images"):
+        for page_num in page_numbers:
+            page = doc.doc.load_page(page_num)
             # Get all images from the page
             for img_index, img in enumerate(page.get_images(full=True)):
                 xref = img[0]
-                base_image = doc.extract_image(xref)
-                # Generate description for the image
-                descriptions = generate_image_caption(base_image["image"], target_lang)
-                
-                images_data.append({
-                    "page": page_num + 1,
-                    "image_index": img_index + 1,
-                    "alt_text": descriptions["basic_description"],
-                    "width": descriptions["width"],
-                    "height": descriptions["height"],
-                    "role": "graphic",
-                    "aria-label": descriptions["aria-label"],
-                    "accessibility": {
-                        "complies": bool(descriptions["basic_description"].strip()),
-                        "warning": "" if descriptions["basic_description"].strip() 
-                                  else "Missing detailed description"
-                    }
-                })
+                if xref not in described and xref not in new_xrefs:
+                    # Images repeated on many pages share one xref
+                    new_xrefs.append(xref)
+                    images_bytes.append(doc.doc.extract_image(xref)["image"])
+                found.append((page_num, img_index, xref))
+    return found, new_xrefs, images_bytes
+
+def image_records(found: list, described: dict, batch: TranslationBatch) -> list:
+    """
+    Build the image entries of a document and queue their translation
+    Args:
+        found: (page index, image index, xref) of every image, from collect_images
+        described: xref -> description mapping covering every found image
+        batch: Translation batch the captions are queued on
+    Returns:
+        List of images with metadata and descriptions
+    """
+    images_data = []
+    for page_num, img_index, xref in found:
+        descriptions = described[xref]
+        images_data.append(queue_image_translation(batch, {
+            "page": page_num + 1,
+            "image_index": img_index + 1,
+            "alt_text": descriptions["basic_description"],
+            "width": descriptions["width"],
+            "height": descriptions["height"],
+            "role": descriptions["role"],
+            "aria-label": descriptions["aria-label"],
+            "accessibility": {
+                "complies": bool(descriptions["basic_description"].strip()),
+                "warning": "" if descriptions["basic_description"].strip() 
+                          else "Missing detailed description"
+            }
+        }))
+    return images_data
+
+def extract_pdf_images(source, target_lang: str = "en", batch: TranslationBatch = None) -> list:
+    """
+    Extract images from PDF with accessibility data
+    Args:
+        source: DocumentContext or path to the PDF file
+        target_lang: Target language for descriptions
+        batch: Request translation batch; captions are only queued on it and
+            are translated once the caller runs it
+    Returns:
+        List of images with metadata and descriptions
+    """
+    own_batch = batch is None
+    if own_batch:
+        batch = TranslationBatch(translation_service, target_lang)
+    try:
+        with open_document(source) as doc:
+            images_data = page_images(doc, range(len(doc)), batch)
+        if own_batch:
+            batch.run()
         return images_data
     except Exception as e:
         raise Exception(f"Image extraction failed: {str(e)}")
 
+def simplify_table(table: dict) -> dict:
+    """Reduce a table to the fields returned by /parse-pdf"""
+    return {
+        "headers": table["accessibility"]["headers"],
+        "rows": table["rows"],
+        "summary": table["summary"]
+    }
+
+def simplify_image(img: dict) -> dict:
+    """Reduce an image to the fields returned by /parse-pdf"""
+    return {
+        "page": img["page"],
+        "alt_text": img["alt_text"],
+        "width": img["width"],
+        "height": img["height"],
+        "aria-label": img.get("aria-label", img["alt_text"])
+    }
+
+def accessibility_features(images: list, tables: list) -> list:
+    """Accessibility features reported for the simplified images and tables"""
+    return [
+        "alt-text" if all(img.get("alt_text") for img in images) else "missing-alt-text",
+        "semantic-tables" if all(tbl.get("headers") for tbl in tables) else "simple-tables"
+    ]
+
+def process_documents(documents: list, target_lang: str, job=None, described: list = None) -> list:
+    """
+    Extract, caption and translate the pages of several documents together
+    Pages found in the page cache are reused as they are. The others are
+    extracted (possibly in parallel), then the new images of every document
+    are captioned and all strings translated in shared model batches, and
+    the results cached by page content hash.
+    Args:
+        documents: List of (DocumentContext, zero-based page indexes) pairs
+        target_lang: Target language for translation
+        job: Optional job used to report progress
+        described: Optional list with one xref -> description mapping per
+            document, reused across calls
+    Returns:
+        One list of simplified page contents per document, in page order
+    """
+    if described is None:
+        described = [{} for _ in documents]
+    batch = TranslationBatch(translation_service, target_lang)
+    work = []
+    if job is not None:
+        job.report("extracting", 0.1)
+    for doc, page_numbers in documents:
+        keys = {page_num: page_cache_key(doc, page_num, target_lang) for page_num in page_numbers}
+        cached = page_cache.get_many(list(keys.values()))
+        missing = [page_num for page_num in page_numbers if keys[page_num] not in cached]
+        pages_total.inc(len(missing), source="processed")
+        pages_total.inc(len(page_numbers) - len(missing), source="cache")
+
+        # Collect every string to translate, then translate them in batches
+        pages = extract_pages(doc, missing) if missing else []
+        for page in pages:
+            page["text"] = queue_text_translation(batch, page["text"])
+            page["tables"] = [queue_table_translation(batch, table) for table in page["tables"]]
+            page["formulas"] = [queue_formula_translation(batch, formula)
+                                for formula in page["formulas"]]
+            page["images"] = []
+        work.append((doc, page_numbers, keys, cached, missing, pages))
+
+    if job is not None:
+        job.report("captioning", 0.4)
+    found = [collect_images(doc, missing, seen)
+             for (doc, _, _, _, missing, _), seen in zip(work, described)]
+    # One captioning pass over the new images of every document
+    descriptions = iter(describe_images([image for _, _, images_bytes in found
+                                         for image in images_bytes]))
+    for (found_images, new_xrefs, _), seen, (_, _, _, _, _, pages) in zip(found, described, work):
+        seen.update(zip(new_xrefs, descriptions))
+        by_page = {page["page"]: page for page in pages}
+        for img in image_records(found_images, seen, batch):
+            by_page[img["page"]]["images"].append(img)
+    if job is not None:
+        job.report("translating", 0.8)
+    batch.run()
+
+    results = []
+    for doc, page_numbers, keys, cached, missing, pages in work:
+        processed = {}
+        for page_num, page in zip(missing, pages):
+            processed[page_num] = {
+                "page": page_num + 1,
+                "text": "".join(page["text"]),
+                "tables": [simplify_table(table) for table in page["tables"]],
+                "formulas": page["formulas"],
+                "images": [simplify_image(img) for img in page["images"]]
+            }
+        page_cache.set_many({keys[page_num]: processed[page_num] for page_num in missing})
+        results.append([processed[page_num] if page_num in processed
+                        else place_page(cached[keys[page_num]], page_num)
+                        for page_num in page_numbers])
+    return results
+
+def process_pages(doc: DocumentContext, page_numbers: list, target_lang: str,
+                  job=None, described: dict = None) -> list:
+    """
+    Extract, caption and translate some pages of a document
+    Args:
+        doc: Shared document context
+        page_numbers: Zero-based page indexes, in order
+        target_lang: Target language for translation
+        job: Optional job used to report progress
+        described: Optional xref -> description mapping reused across calls
+    Returns:
+        Simplified content of each page, in page order
+    """
+    return process_documents([(doc, page_numbers)], target_lang, job,
+                             [described if described is not None else {}])[0]
+
+def iter_page_results(doc: DocumentContext, target_lang: str, page_numbers: list = None):
+    """
+    Process a document for streaming
+    The first page is processed on its own so it can be sent to the client
+    as soon as possible. The others follow STREAM_BATCH_PAGES at a time, so
+    their images are captioned and their strings translated in shared batches.
+    Args:
+        doc: Shared document context
+        target_lang: Target language for translation
+        page_numbers: Zero-based page indexes in order (default: every page)
+    Yields:
+        Simplified content of one page, in page order
+    """
+    described = {}  # Images already described on earlier pages
+    if page_numbers is None:
+        page_numbers = list(range(len(doc)))
+    batch_pages = app.config['STREAM_BATCH_PAGES']
+    groups = [page_numbers[:1]] + [page_numbers[start:start + batch_pages]
+                                   for start in range(1, len(page_numbers), batch_pages)]
+    for group in groups:
+        if group:
+            yield from process_pages(doc, group, target_lang, described=described)
+
 def check_wcag_compliance(content):
     """
     Validate content against WCAG 2.1 accessibility standards
@@ -300,11 +1434,11 @@ def check_wcag_compliance(content):
     
     return compliance
 
-@app.route('/parse-pdf', methods=['POST'])
-def parse_pdf():
+def upload_error():
     """
-    Main endpoint for PDF processing
-    Accepts PDF file and returns structured content with accessibility info
+    Validate the uploaded file of the current request
+    Returns:
+        Error response tuple, or None if the upload is acceptable
     """
     # Check if file was uploaded
     if 'pdfFile' not in request.files:
@@ -317,11 +1451,8 @@ def parse_pdf():
             }
         }), 400
     
-    file = request.files['pdfFile']
-    target_lang = request.form.get('language', 'en')  # Default to English
-    
     # Validate file type
-    if not allowed_file(file.filename):
+    if not allowed_file(request.files['pdfFile'].filename):
         return jsonify({
             "status": "error",
             "error": "Invalid file type",
@@ -330,58 +1461,544 @@ def parse_pdf():
                 "compliance": "WCAG 2.1 AA (failed)"
             }
         }), 400
+    return None
 
-    filepath = None
-    try:
-        # Secure the filename and save temporarily
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Extract content with simplified structure
-        content = {
-            "text": extract_pdf_text(filepath, target_lang),
-            "tables": [{
-                "headers": table["accessibility"]["headers"],
-                "rows": table["rows"],
-                "summary": table["summary"]
-            } for table in extract_pdf_tables(filepath, target_lang)],
-            "images": [{
-                "page": img["page"],
-                "alt_text": img["alt_text"],
-                "width": img["width"],
-                "height": img["height"],
-                "aria-label": img.get("aria-label", img["alt_text"])
-            } for img in extract_pdf_images(filepath, target_lang)]
+def processing_error(message: str, status_code: int = 500):
+    """Error response for a document that could not be processed"""
+    return jsonify({
+        "status": "error",
+        "error": message,
+        "accessibility": {
+            "error_type": "processing_error",
+            "compliance": "WCAG 2.1 AA (failed)"
         }
-        
-        # Return successful response with extracted content
-        return jsonify({
-            "status": "success",
-            **content,  # Unpack content directly into response
-            "accessibility": {
-                "features": [
-                    "alt-text" if all(img.get("alt_text") for img in content["images"]) else "missing-alt-text",
-                    "semantic-tables" if all(tbl.get("headers") for tbl in content["tables"]) else "simple-tables"
-                ]
-            }
-        })
-        
-    except Exception as e:
-        logger.error(f"Processing failed: {traceback.format_exc()}")
-        return jsonify({
+    }), status_code
+
+def queue_full_error(message: str):
+    """Error response telling the client to retry once the queue drains"""
+    response, status_code = processing_error(message, 503)
+    response.headers['Retry-After'] = '30'
+    return response, status_code
+
+def json_response(payload: dict):
+    """
+    Result response in the layout and encoding the client asked for
+    Clients that prefer application/vnd.accessible-pdf.compact+json get the
+    compact layout (see compact.encode_result), and large bodies are
+    compressed with zstd or gzip when Accept-Encoding allows it.
+    Args:
+        payload: Response payload
+    Returns:
+        Flask response
+    """
+    mimetype = request.accept_mimetypes.best_match(['application/json', COMPACT_MIMETYPE],
+                                                   'application/json')
+    with timed(stage_seconds, "serialize"):
+        if mimetype == COMPACT_MIMETYPE:
+            payload = encode_result(payload)
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        encoding = None
+        if len(body) >= app.config['RESPONSE_COMPRESS_MIN_BYTES']:
+            encoding = request.accept_encodings.best_match(available_encodings())
+            if encoding:
+                body = compress(body, encoding)
+
+    response = Response(body, mimetype=mimetype)
+    if encoding:
+        response.content_encoding = encoding
+    # Caches must not hand one client's layout or encoding to another
+    response.vary.update(('Accept', 'Accept-Encoding'))
+    return response
+
+def batch_uploads():
+    """
+    Collect the PDFs of a batch request
+    PDFs can be sent as several "pdfFiles" fields, as ZIP archives in
+    "archive" fields, or both.
+    Returns:
+        Tuple of the (file name, UploadedPDF) pairs and an error response
+        tuple, or None if the request is acceptable
+    """
+    documents = []
+    total_bytes = 0
+
+    def fail(message: str, error: str):
+        for _, upload in documents:
+            upload.close()
+        return [], (jsonify({
             "status": "error",
-            "error": str(e),
+            "error": message,
             "accessibility": {
-                "error_type": "processing_error",
+                "error": error,
                 "compliance": "WCAG 2.1 AA (failed)"
             }
-        }), 500
+        }), 400)
+
+    sources = []
+    for file in request.files.getlist('pdfFiles') + request.files.getlist('archive'):
+        if file.filename.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(file.stream)
+            except zipfile.BadZipFile:
+                return fail(f"Invalid archive: {file.filename}", "invalid_format")
+            for info in archive.infolist():
+                # Skip folders and anything else that is not a PDF
+                if not info.is_dir() and allowed_file(info.filename):
+                    sources.append((info.filename, info.file_size,
+                                    lambda archive=archive, info=info: archive.open(info)))
+        elif allowed_file(file.filename):
+            sources.append((file.filename, 0, lambda file=file: file.stream))
+        else:
+            return fail(f"Invalid file type: {file.filename}", "invalid_format")
+
+    if not sources:
+        return fail("No PDF files uploaded", "missing_file")
+    if len(sources) > app.config['BATCH_MAX_DOCUMENTS']:
+        return fail(f"Too many documents, at most {app.config['BATCH_MAX_DOCUMENTS']} per batch",
+                    "too_many_files")
+    for filename, size, open_stream in sources:
+        # Archive entries are checked against their declared size before
+        # inflating; zipfile never reads past it
+        if total_bytes + size > app.config['BATCH_MAX_BYTES']:
+            return fail("Batch is too large", "too_large")
+        try:
+            upload = UploadedPDF(open_stream(), app.config['UPLOAD_SPOOL_BYTES'])
+        except (zipfile.BadZipFile, RuntimeError, NotImplementedError):
+            # Corrupt, encrypted, or compressed with an unsupported method
+            return fail(f"Invalid archive entry: {filename}", "invalid_format")
+        documents.append((filename, upload))
+        total_bytes += len(upload)
+        if total_bytes > app.config['BATCH_MAX_BYTES']:
+            return fail("Batch is too large", "too_large")
+    return documents, None
+
+def admit_document(upload: UploadedPDF, page_range: list = None, wait: float = None):
+    """
+    Reserve processing budget for an upload, waiting for it if needed
+    Args:
+        upload: The uploaded PDF
+        page_range: Optional result of parse_page_range
+        wait: Seconds to wait for budget (default: ADMISSION_WAIT_SECONDS)
+    Returns:
+        Admission ticket; release it once the document has been processed
+    Raises:
+        AdmissionRejected: If the budget did not free up in time
+        ValueError: If no requested page exists in the document
+    """
+    if wait is None:
+        wait = app.config['ADMISSION_WAIT_SECONDS']
+    return admission.admit(estimate_cost(upload.data, page_range), wait)
+
+def process_document(job, upload: UploadedPDF, target_lang: str, page_range: list = None) -> dict:
+    """
+    Extract, caption and translate the requested pages of a PDF
+    Args:
+        job: Job used to report progress
+        upload: The uploaded PDF
+        target_lang: Target language for translation
+        page_range: Optional result of parse_page_range; only these pages
+            are processed
+    Returns:
+        Response payload with the extracted content
+    """
+    # Open the PDF once and share it across all extractors
+    with timed(stage_seconds, "open"):
+        doc = DocumentContext(upload)
+    with doc:
+        page_numbers = select_pages(page_range, len(doc))
+        # Only pages that are not in the page cache are processed
+        pages = process_pages(doc, page_numbers, target_lang, job)
+        return document_result(pages, page_numbers, len(doc))
+
+def document_result(pages: list, page_numbers: list, page_count: int) -> dict:
+    """
+    Assemble the /parse-pdf response of a document from its processed pages
+    Args:
+        pages: Simplified page contents, in page order
+        page_numbers: Zero-based indexes of those pages
+        page_count: Number of pages in the document
+    Returns:
+        Response payload with the extracted content
+    """
+    # Extract content with simplified structure
+    content = {
+        "text": "".join(page["text"] for page in pages),
+        "tables": [table for page in pages for table in page["tables"]],
+        "formulas": [formula for page in pages for formula in page["formulas"]],
+        "images": [img for page in pages for img in page["images"]]
+    }
+    
+    # Build successful response with extracted content
+    return {
+        "status": "success",
+        **content,  # Unpack content directly into response
+        "page_count": page_count,
+        "pages": [page_num + 1 for page_num in page_numbers],
+        "accessibility": {
+            "features": accessibility_features(content["images"], content["tables"])
+        }
+    }
+
+def process_pdf(job, upload: UploadedPDF, target_lang: str, page_range: list = None,
+                include_timings: bool = False, ticket=None) -> dict:
+    """
+    Extract, caption and translate a PDF, using the result cache
+    Runs on a job queue worker thread and releases the upload and the
+    admission ticket when done.
+    Args:
+        job: Job used to report progress
+        upload: The uploaded PDF
+        target_lang: Target language for translation
+        page_range: Optional result of parse_page_range
+        include_timings: Add the seconds spent in each stage as "timings"
+        ticket: Admission ticket of the request
+    Returns:
+        Response payload with the extracted content
+    """
+    start = time.perf_counter()
+    try:
+        with collect_timings() as timings:
+            # Serve repeated uploads from the cache without opening the PDF
+            cache_key = ResultCache.make_key(upload.data, target_lang, MODEL_VERSIONS)
+            result = result_cache.get(cache_key) if page_range is None else None
+            if result is None:
+                result = process_document(job, upload, target_lang, page_range)
+                if page_range is None:
+                    result_cache.set(cache_key, result)
+
+        if include_timings:
+            # Never cached, the timings describe this request only
+            timings["total"] = time.perf_counter() - start
+            result = {**result, "timings": {stage: round(seconds, 4)
+                                            for stage, seconds in timings.items()}}
+        return result
         
     finally:
-        # Clean up - remove temporary file
-        if filepath and os.path.exists(filepath):
-            os.remove(filepath)
+        upload.close()
+        if ticket is not None:
+            ticket.release()
+
+def process_batch(job, documents: list, target_lang: str, ticket=None) -> dict:
+    """
+    Extract, caption and translate many PDFs with shared model batches
+    Runs on a batch queue worker thread and releases the uploads and the
+    admission ticket when done.
+    Args:
+        job: Job used to report progress
+        documents: List of (file name, UploadedPDF) pairs
+        target_lang: Target language for translation
+        ticket: Admission ticket of the request
+    Returns:
+        Payload with one /parse-pdf style result per document, in input order
+    """
+    results = [None] * len(documents)
+    pending = []  # (index, file name, result cache key, document)
+    try:
+        for index, (filename, upload) in enumerate(documents):
+            # Documents seen before are served from the result cache
+            cache_key = ResultCache.make_key(upload.data, target_lang, MODEL_VERSIONS)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                results[index] = {"filename": filename, **cached}
+                continue
+            try:
+                with timed(stage_seconds, "open"):
+                    pending.append((index, filename, cache_key, DocumentContext(upload)))
+            except Exception as e:
+                # One unreadable file does not fail the whole batch
+                results[index] = {"filename": filename, "status": "error",
+                                  "error": f"Could not open PDF: {str(e)}"}
+
+        work = [(doc, list(range(len(doc)))) for _, _, _, doc in pending]
+        try:
+            processed = process_documents(work, target_lang, job)
+        except Exception:
+            # Process the documents one at a time to find the ones that fail
+            logger.warning(f"Batch processing failed, retrying per document: {traceback.format_exc()}")
+            processed = []
+            for document in work:
+                try:
+                    processed.append(process_documents([document], target_lang)[0])
+                except Exception as e:
+                    processed.append(e)
+        for (index, filename, cache_key, doc), pages in zip(pending, processed):
+            if isinstance(pages, Exception):
+                results[index] = {"filename": filename, "status": "error",
+                                  "error": f"Could not process PDF: {str(pages)}"}
+                continue
+            result = document_result(pages, list(range(len(doc))), len(doc))
+            result_cache.set(cache_key, result)
+            results[index] = {"filename": filename, **result}
+
+        return {
+            "status": "success",
+            "language": target_lang,
+            "document_count": len(documents),
+            "documents": results
+        }
+    finally:
+        for _, _, _, doc in pending:
+            doc.close()
+        for _, upload in documents:
+            upload.close()
+        if ticket is not None:
+            ticket.release()
+
+def stream_pdf(upload: UploadedPDF, target_lang: str, event_stream: bool,
+               page_range: list = None, ticket=None):
+    """
+    Process a PDF and stream each page as soon as it is ready
+    Events are "start" (page count), one "page" per page, then "done" with
+    the document-wide accessibility features, or "error". A whole document
+    is added to the result cache, so the next upload is answered from it.
+    Args:
+        upload: The uploaded PDF, released when the stream ends
+        target_lang: Target language for translation
+        event_stream: Emit Server-Sent Events instead of NDJSON lines
+        page_range: Optional result of parse_page_range
+        ticket: Admission ticket, released when the stream ends
+    Yields:
+        Encoded events
+    """
+    def encode(event_type: str, payload: dict) -> str:
+        data = json.dumps({"type": event_type, **payload}, ensure_ascii=False)
+        return f"event: {event_type}\ndata: {data}\n\n" if event_stream else data + "\n"
+
+    try:
+        with timed(stage_seconds, "open"):
+            doc = DocumentContext(upload)
+        with doc:
+            page_numbers = select_pages(page_range, len(doc))
+            yield encode("start", {"pages": len(page_numbers), "page_count": len(doc),
+                                   "language": target_lang})
+            pages = []
+            for page in iter_page_results(doc, target_lang, page_numbers):
+                pages.append(page)
+                yield encode("page", page)
+            result = document_result(pages, page_numbers, len(doc))
+        if page_range is None:
+            result_cache.set(ResultCache.make_key(upload.data, target_lang, MODEL_VERSIONS), result)
+        yield encode("done", {
+            "status": "success",
+            "language": target_lang,
+            "accessibility": result["accessibility"]
+        })
+    except Exception as e:
+        logger.error(f"Streaming failed: {traceback.format_exc()}")
+        yield encode("error", {"status": "error", "error": str(e)})
+    finally:
+        upload.close()
+        if ticket is not None:
+            ticket.release()
+
+# Background queue running process_pdf on a bounded pool of workers
+job_queue = JobQueue(
+    process_pdf,
+    workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_QUEUE_SIZE'],
+    retention=app.config['JOB_RETENTION_SECONDS'],
+    max_finished=app.config['JOB_MAX_FINISHED'],
+    # /jobs can be polled through any gunicorn worker
+    store=JobStore(app.config['JOB_STORE_PATH'])
+)
+
+# Separate queue for multi-document batches so they do not block single uploads
+batch_queue = JobQueue(
+    process_batch,
+    workers=app.config['BATCH_WORKERS'],
+    max_pending=app.config['BATCH_QUEUE_SIZE'],
+    retention=app.config['JOB_RETENTION_SECONDS'],
+    max_finished=app.config['JOB_MAX_FINISHED']
+)
+
+@app.route('/parse-pdf', methods=['POST'])
+def parse_pdf():
+    """
+    Main endpoint for PDF processing
+    Accepts PDF file and returns structured content with accessibility info
+    Submits a job and waits for it to finish, or streams the result page by
+    page when the client accepts application/x-ndjson or text/event-stream;
+    cached results are sent whole to streaming clients that also accept JSON
+    An optional "pages" field such as "40" or "3-5" limits the pages processed
+    and "timings=1" adds the seconds spent in each processing stage
+    Clients accepting application/vnd.accessible-pdf.compact+json get the
+    compact layout; large responses are compressed per Accept-Encoding
+    """
+    error = upload_error()
+    if error:
+        return error
+    
+    file = request.files['pdfFile']
+    target_lang = request.form.get('language', 'en')  # Default to English
+    try:
+        # Optional page range such as "40" or "3-5"; every page by default
+        page_range = parse_page_range(request.form['pages']) if request.form.get('pages') else None
+    except ValueError as e:
+        return processing_error(str(e), 400)
+    include_timings = request.values.get('timings', '').lower() in ('1', 'true', 'yes')
+    upload = UploadedPDF(file.stream, app.config['UPLOAD_SPOOL_BYTES'])
+
+    # Cached documents do not need to wait for a worker; they are sent whole,
+    # also to streaming clients that accept JSON
+    if (page_range is None and not include_timings and
+            request.accept_mimetypes.best_match(['application/json', COMPACT_MIMETYPE])):
+        cached = result_cache.get(ResultCache.make_key(upload.data, target_lang, MODEL_VERSIONS))
+        if cached is not None:
+            upload.close()
+            return json_response(cached)
+
+    # Streaming clients get each page as soon as it has been processed
+    mimetype = request.accept_mimetypes.best_match(
+        ['application/json', COMPACT_MIMETYPE, 'application/x-ndjson', 'text/event-stream'])
+    if mimetype in ('application/x-ndjson', 'text/event-stream'):
+        try:
+            ticket = admit_document(upload, page_range)
+        except AdmissionRejected as e:
+            upload.close()
+            return queue_full_error(str(e))
+        except ValueError as e:
+            upload.close()
+            return processing_error(str(e), 400)
+        response = Response(
+            stream_pdf(upload, target_lang, mimetype == 'text/event-stream', page_range, ticket),
+            mimetype=mimetype,
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        # Also runs if the client goes away before the stream starts
+        response.call_on_close(ticket.release)
+        return response
+
+    # Wait for memory and CPU budget, or ask the client to come back later
+    try:
+        ticket = admit_document(upload, page_range)
+    except AdmissionRejected as e:
+        upload.close()
+        return queue_full_error(str(e))
+    except ValueError as e:
+        # The page range is checked against the page count before queueing
+        upload.close()
+        return processing_error(str(e), 400)
+
+    try:
+        job = job_queue.submit(upload, target_lang, page_range, include_timings, ticket,
+                               persist=False)
+    except QueueFullError as e:
+        ticket.release()
+        upload.close()
+        return queue_full_error(str(e))
+
+    job.wait()
+    # The result goes straight to this client, nobody polls for it
+    job_queue.discard(job.id)
+    if job.status == "failed":
+        return processing_error(job.error)
+    return json_response(job.result)
+
+@app.route('/parse-batch', methods=['POST'])
+def parse_batch():
+    """
+    Process many PDFs, e.g. a course pack, in one request
+    Accepts several "pdfFiles" and/or ZIP archives of PDFs in "archive".
+    Image captioning and translation are batched across all the documents.
+    Returns one result per document, shaped like the /parse-pdf response
+    and tagged with its file name
+    """
+    # A course pack may exceed the single-upload limit; the batch limits apply
+    request.max_content_length = app.config['BATCH_MAX_BYTES'] + 1024 * 1024  # Multipart overhead
+    documents, error = batch_uploads()
+    if error:
+        return error
+    target_lang = request.form.get('language', 'en')  # Default to English
+
+    # The documents are processed together, so they need budget together
+    costs = [estimate_cost(upload.data) for _, upload in documents]
+    try:
+        ticket = admission.admit(
+            Cost(sum(cost.memory for cost in costs), sum(cost.seconds for cost in costs)),
+            app.config['ADMISSION_WAIT_SECONDS'])
+    except AdmissionRejected as e:
+        for _, upload in documents:
+            upload.close()
+        return queue_full_error(str(e))
+
+    try:
+        job = batch_queue.submit(documents, target_lang, ticket)
+    except QueueFullError as e:
+        ticket.release()
+        for _, upload in documents:
+            upload.close()
+        return queue_full_error(str(e))
+
+    job.wait()
+    # The result goes straight to this client, nobody polls for it
+    batch_queue.discard(job.id)
+    if job.status == "failed":
+        return processing_error(job.error)
+    return json_response(job.result)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a PDF for background processing
+    Returns immediately with the job id and the URLs to poll
+    """
+    error = upload_error()
+    if error:
+        return error
+    
+    file = request.files['pdfFile']
+    target_lang = request.form.get('language', 'en')  # Default to English
+    try:
+        # Optional page range such as "40" or "3-5"; every page by default
+        page_range = parse_page_range(request.form['pages']) if request.form.get('pages') else None
+    except ValueError as e:
+        return processing_error(str(e), 400)
+    include_timings = request.values.get('timings', '').lower() in ('1', 'true', 'yes')
+    upload = UploadedPDF(file.stream, app.config['UPLOAD_SPOOL_BYTES'])
+    try:
+        # Do not hold up the client; queued jobs keep their budget reserved
+        ticket = admit_document(upload, page_range, wait=0)
+    except AdmissionRejected as e:
+        upload.close()
+        return queue_full_error(str(e))
+    except ValueError as e:
+        upload.close()
+        return processing_error(str(e), 400)
+    try:
+        job = job_queue.submit(upload, target_lang, page_range, include_timings, ticket)
+    except QueueFullError as e:
+        ticket.release()
+        upload.close()
+        return queue_full_error(str(e))
+
+    return jsonify({
+        **job.to_dict(),
+        "status_url": f"/jobs/{job.id}",
+        "result_url": f"/jobs/{job.id}/result"
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the status and progress of a job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "error": "Unknown job"}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """
+    Fetch the result of a finished job
+    Responds 202 with the job status while it is still running
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "error": "Unknown job"}), 404
+    if job.status == "failed":
+        return processing_error(job.error)
+    if job.status != "done":
+        return jsonify(job.to_dict()), 202
+    return json_response(job.result)
 
 @app.route('/health')
 def health_check():
@@ -392,10 +2009,34 @@ def health_check():
     return jsonify({
         "status": "operational",
         "memory_usage_mb": psutil.Process().memory_info().rss / 1024 / 1024,
-        "models_loaded": bool(model),
+        "models_loaded": models.loaded(),
+        "cache_stats": {
+            "results": result_cache.stats,
+            "captions": caption_cache.stats,
+            "translations": translation_memory.stats
+        },
+        "table_screening": table_screening,
+        "admission": admission.snapshot(),
         "system_load": os.getloadavg()[0]
     })
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Prometheus metrics of this worker process, labelled with its process id
+    Stage latencies, batch sizes and page, image and string counters, plus
+    the cache and table pre-screen statistics kept elsewhere
+    """
+    for name, cache in (("captions", caption_cache), ("translations", translation_memory),
+                        ("pages", page_cache), ("results", result_cache)):
+        cache_requests_total.set(cache.stats["hits"], cache=name, result="hit")
+        cache_requests_total.set(cache.stats["misses"], cache=name, result="miss")
+    table_screening_total.set(table_screening["pages"] - table_screening["skipped"], outcome="extracted")
+    table_screening_total.set(table_screening["skipped"], outcome="skipped")
+    admission_total.set(admission.stats["admitted"], outcome="admitted")
+    admission_total.set(admission.stats["rejected"], outcome="rejected")
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     # Start the Flask development server
     app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Compare the int8 CPU inference profile against the fp32 baseline
+Runs BLIP captioning and M2M100 translation with both profiles and reports
+latency, speedup and how often the int8 outputs match the fp32 outputs.
+
+Usage (from the serever directory):
+    python benchmarks/compare_inference.py --images ./sample_images --lang es
+"""
+# Import required libraries
+import argparse  # Command line options
+import json  # Report output
+import os  # Operating system interfaces
+import statistics  # Latency summaries
+import sys  # Import path setup
+import time  # Timing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import torch  # PyTorch for deep learning
+from PIL import Image  # Image processing
+import app as server  # Model loaders and inference profile
+
+SAMPLE_TEXTS = [
+    "The mitochondria is the powerhouse of the cell.",
+    "Table 1 with 12 rows",
+    "Mathematical formula: E = mc^2",
+    "Students must submit the assignment before the end of the week.",
+    "The results show a significant improvement over the previous method.",
+    "Image described as: a diagram of a plant cell"
+]
+
+
+def timed(fn, repeats: int):
+    """Run fn repeats times and return its last output and the latencies"""
+    latencies = []
+    output = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        output = fn()
+        latencies.append(time.perf_counter() - start)
+    return output, latencies
+
+
+def word_overlap(reference: str, candidate: str) -> float:
+    """Share of reference words that also appear in the candidate"""
+    reference_words = reference.lower().split()
+    if not reference_words:
+        return 1.0
+    candidate_words = set(candidate.lower().split())
+    return sum(word in candidate_words for word in reference_words) / len(reference_words)
+
+
+def summarize(name: str, baseline: tuple, quantized: tuple) -> dict:
+    """Latency and agreement of one model under both profiles"""
+    (base_outputs, base_latencies), (q_outputs, q_latencies) = baseline, quantized
+    base_mean = statistics.mean(base_latencies)
+    q_mean = statistics.mean(q_latencies)
+    return {
+        "model": name,
+        "fp32_mean_s": round(base_mean, 4),
+        "int8_mean_s": round(q_mean, 4),
+        "speedup": round(base_mean / q_mean, 2) if q_mean else None,
+        "exact_match": round(sum(a == b for a, b in zip(base_outputs, q_outputs)) / len(base_outputs), 3),
+        "word_overlap": round(statistics.mean(word_overlap(a, b) for a, b in zip(base_outputs, q_outputs)), 3),
+        "examples": [{"fp32": a, "int8": b} for a, b in list(zip(base_outputs, q_outputs))[:3]]
+    }
+
+
+def compare_captioning(image_dir: str, repeats: int) -> dict:
+    """Caption every image in image_dir with both profiles"""
+    images = []
+    for name in sorted(os.listdir(image_dir)):
+        try:
+            images.append(Image.open(os.path.join(image_dir, name)).convert("RGB"))
+        except OSError:
+            continue
+    if not images:
+        raise SystemExit(f"No readable images in {image_dir}")
+
+    server.app.config['INFERENCE_QUANTIZE'] = False
+    processor, fp32_model = server.load_captioning_model()
+    server.app.config['INFERENCE_QUANTIZE'] = True
+    int8_model = server.quantize_model(fp32_model)
+
+    def caption(model):
+        inputs = processor(images=images, return_tensors="pt")
+        with torch.inference_mode():
+            ids = model.generate(**inputs, **server.generation_kwargs())
+        return processor.batch_decode(ids, skip_special_tokens=True)
+
+    return summarize("captioning",
+                     timed(lambda: caption(fp32_model), repeats),
+                     timed(lambda: caption(int8_model), repeats))
+
+
+def compare_translation(texts: list, target_lang: str, repeats: int) -> dict:
+    """Translate texts with both profiles"""
+    server.app.config['INFERENCE_QUANTIZE'] = False
+    pipe = server.load_text_processor()
+    fp32_model = pipe.model
+    server.app.config['INFERENCE_QUANTIZE'] = True
+    int8_model = server.quantize_model(fp32_model)
+
+    def translate(model):
+        pipe.model = model
+        outputs = pipe(texts, batch_size=len(texts),
+                       forced_bos_token_id=pipe.tokenizer.get_lang_id(target_lang),
+                       **server.generation_kwargs())
+        return [(o[0] if isinstance(o, list) else o)["generated_text"] for o in outputs]
+
+    return summarize("text",
+                     timed(lambda: translate(fp32_model), repeats),
+                     timed(lambda: translate(int8_model), repeats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", help="Directory of sample images for captioning")
+    parser.add_argument("--texts", help="Text file with one sentence per line")
+    parser.add_argument("--lang", default="es", help="Target language for translation")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per profile")
+    parser.add_argument("--threads", type=int, default=0, help="Torch threads, 0 keeps the default")
+    parser.add_argument("--decoding", choices=["greedy", "beam"], default="greedy")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    server.app.config['INFERENCE_THREADS'] = args.threads
+    server.app.config['INFERENCE_DECODING'] = args.decoding
+    server.configure_torch_threads()
+
+    texts = SAMPLE_TEXTS
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+    report = {
+        "threads": torch.get_num_threads(),
+        "decoding": args.decoding,
+        "results": []
+    }
+    if args.images:
+        report["results"].append(compare_captioning(args.images, args.repeats))
+    report["results"].append(compare_translation(texts, args.lang, args.repeats))
+
+    for result in report["results"]:
+        print(f"{result['model']:<12} fp32 {result['fp32_mean_s']:.3f}s  "
+              f"int8 {result['int8_mean_s']:.3f}s  speedup x{result['speedup']}  "
+              f"exact {result['exact_match']:.0%}  overlap {result['word_overlap']:.0%}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
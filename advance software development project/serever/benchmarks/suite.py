@@ -0,0 +1,370 @@
+"""
+Reproducible benchmark suite for the PDF processing server
+Generates synthetic text-, table-, image- and formula-heavy PDFs, replaces
+the BLIP and translation models with deterministic CPU stubs, and times each
+extractor and the full /parse-pdf path, along with the peak traced Python
+memory and the peak resident memory of the process and its extraction
+workers. Results can be saved as a JSON baseline and later runs compared
+against it.
+
+Usage (from the serever directory):
+    python benchmarks/suite.py --pages 1 10 100 --output baseline.json
+    python benchmarks/suite.py --pages 1 10 100 --compare baseline.json
+"""
+# Import required libraries
+import argparse  # Command line options
+import io  # In-memory PDF uploads
+import json  # Baseline files
+import os  # Operating system interfaces
+import platform  # Environment description
+import random  # Deterministic synthetic content
+import sys  # Import path setup
+import tempfile  # Isolated cache directories
+import threading  # Resident memory sampling
+import time  # Timing
+import tracemalloc  # Peak memory of Python allocations
+from types import SimpleNamespace  # Stub model attributes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the server's caches out of the working directory
+LAUNCH_DIR = os.getcwd()
+os.chdir(tempfile.mkdtemp(prefix="pdf-bench-"))
+
+import fitz  # PyMuPDF for PDF generation
+import psutil  # Process memory
+import app as server  # Extractors and Flask app under test
+from persistent_cache import PersistentCache  # Fresh caches per run
+from result_cache import ResultCache  # Fresh caches per run
+from text_builder import make_text_pdf  # Text-heavy documents
+
+KINDS = ("text", "tables", "images", "formulas")
+
+
+def make_table_pdf(pages: int, tables_per_page: int = 3) -> bytes:
+    """Create a PDF with ruled tables on every page"""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        for table in range(tables_per_page):
+            top = 60 + table * 240
+            for row in range(8):
+                for col in range(5):
+                    cell = fitz.Rect(50 + col * 100, top + row * 24, 150 + col * 100, top + 24 + row * 24)
+                    page.draw_rect(cell, width=0.5)
+                    label = f"Column {col + 1}" if row == 0 else f"{page_num}.{table}.{row * col}"
+                    page.insert_text((cell.x0 + 4, cell.y1 - 8), label, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_image_pdf(pages: int, images_per_page: int = 4) -> bytes:
+    """Create a PDF with distinct, captionable images on every page"""
+    from PIL import Image
+    rng = random.Random(0)
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 40), f"Figures for page {page_num + 1}", fontsize=11)
+        for index in range(images_per_page):
+            image = Image.frombytes("RGB", (160, 120), rng.randbytes(160 * 120 * 3))
+            buffer = io.BytesIO()
+            image.save(buffer, "JPEG", quality=80)
+            top = 60 + index * 170
+            page.insert_image(fitz.Rect(50, top, 290, top + 160), stream=buffer.getvalue())
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_formula_pdf(pages: int, formulas_per_page: int = 30) -> bytes:
+    """Create a PDF with LaTeX formulas inline with prose"""
+    samples = [r"x^2 + y^2 = z^2", r"\frac{a}{b} + c", r"\sum_{i=1}^{n} i", r"e^{i\pi} + 1 = 0",
+               r"\sqrt{b^2 - 4ac}", r"\int_0^1 x\,dx", r"\alpha + \beta = \gamma"]
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        for line in range(formulas_per_page):
+            formula = samples[(page_num + line) % len(samples)]
+            page.insert_text((50, 50 + line * 24), f"Equation {line + 1} reads ${formula}$ here.", fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+GENERATORS = {
+    "text": make_text_pdf,
+    "tables": make_table_pdf,
+    "images": make_image_pdf,
+    "formulas": make_formula_pdf
+}
+
+
+def busy_wait(seconds: float):
+    """Spend a fixed amount of CPU time, standing in for a forward pass"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class StubCaptionProcessor:
+    """Deterministic stand-in for BlipProcessor"""
+
+    def __call__(self, images, return_tensors=None):
+        return {"pixel_values": [(image.size, image.resize((1, 1)).getpixel((0, 0))) for image in images]}
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return list(outputs)
+
+
+class StubCaptioner:
+    """Deterministic stand-in for BlipForConditionalGeneration"""
+
+    def __init__(self, seconds_per_input: float):
+        self.seconds_per_input = seconds_per_input
+
+    def generate(self, pixel_values, **kwargs):
+        busy_wait(self.seconds_per_input * len(pixel_values))
+        return [f"a {width}x{height} picture in rgb {colour}" for (width, height), colour in pixel_values]
+
+
+class StubTokenizer:
+    """Word-level tokenizer with the limits of the real models"""
+
+    model_max_length = 512
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def get_lang_id(self, lang: str) -> str:
+        return lang
+
+
+class StubTranslationPipeline:
+    """Deterministic stand-in for the translation and text2text pipelines"""
+
+    def __init__(self, key: str, seconds_per_input: float):
+        self.key = key
+        self.seconds_per_input = seconds_per_input
+        self.tokenizer = StubTokenizer()
+        self.model = SimpleNamespace(generation_config=SimpleNamespace(max_length=200))
+
+    def __call__(self, texts, batch_size=1, target_lang=None, forced_bos_token_id=None, **kwargs):
+        busy_wait(self.seconds_per_input * len(texts))
+        lang = target_lang or forced_bos_token_id
+        return [{self.key: f"[{lang}] {text}"} for text in texts]
+
+
+def install_stub_models(seconds_per_input: float):
+    """Register the stub models in place of the real ones"""
+    server.models.register("captioning", lambda: (StubCaptionProcessor(), StubCaptioner(seconds_per_input)))
+    server.models.register("translator", lambda: StubTranslationPipeline("translation_text", seconds_per_input))
+    server.models.register("text", lambda: StubTranslationPipeline("generated_text", seconds_per_input))
+
+
+def reset_caches():
+    """Give the server empty caches so every run does the full work"""
+    directory = tempfile.mkdtemp(prefix="cache-", dir=".")
+    server.result_cache = ResultCache(os.path.join(directory, "results"),
+                                      max_bytes=server.app.config['RESULT_CACHE_MAX_BYTES'])
+    server.caption_cache = PersistentCache(os.path.join(directory, "captions.sqlite3"), "captions")
+    server.page_cache = PersistentCache(os.path.join(directory, "pages.sqlite3"), "pages")
+    server.translation_memory = PersistentCache(os.path.join(directory, "translations.sqlite3"), "translations")
+    server.translation_service.memory = server.translation_memory
+
+
+class PeakRss:
+    """
+    Highest resident memory of this process and its children during a block
+    Sampled on a background thread, so it covers what tracemalloc cannot
+    see: MuPDF's C heap and the extraction worker processes.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self) -> int:
+        """Current resident bytes of the process tree"""
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        return total
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.sample())
+
+    def __enter__(self):
+        self.peak = self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.sample())
+
+
+def measure(fn, track_memory: bool) -> tuple:
+    """
+    Wall time of one call, and its peak memory if requested
+    tracemalloc and the resident memory sampler slow the call down, so
+    memory is measured in a second run. Both runs start from empty caches.
+    Returns:
+        Tuple of the measurements and the output of the timed run
+    """
+    reset_caches()
+    start = time.perf_counter()
+    output = fn()
+    result = {"seconds": round(time.perf_counter() - start, 4)}
+    if track_memory:
+        reset_caches()
+        with PeakRss() as rss:
+            tracemalloc.start()
+            try:
+                fn()
+                result["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+            finally:
+                tracemalloc.stop()
+        result["peak_rss_mb"] = round(rss.peak / 1024 / 1024, 1)
+    return result, output
+
+
+def parse_pdf(client, pdf: bytes, lang: str) -> dict:
+    """Run the full /parse-pdf path and return its stage timings"""
+    response = client.post("/parse-pdf", data={
+        "pdfFile": (io.BytesIO(pdf), "benchmark.pdf"),
+        "language": lang,
+        "timings": "1"
+    })
+    if response.status_code != 200:
+        raise RuntimeError(f"/parse-pdf failed: {response.get_json()}")
+    return response.get_json()["timings"]
+
+
+def run_case(client, kind: str, pages: int, lang: str, track_memory: bool) -> dict:
+    """Benchmark every extractor and /parse-pdf on one synthetic document"""
+    pdf = GENERATORS[kind](pages)
+    extractors = {
+        "text": server.extract_pdf_text,
+        "tables": server.extract_pdf_tables,
+        "formulas": server.extract_formulas,
+        "images": server.extract_pdf_images
+    }
+
+    def run_extractor(extractor):
+        with server.DocumentContext(pdf) as doc:
+            return extractor(doc, lang)
+
+    case = {"kind": kind, "pages": pages, "pdf_bytes": len(pdf), "extractors": {}}
+    for name, extractor in extractors.items():
+        case["extractors"][name], _ = measure(lambda: run_extractor(extractor), track_memory)
+    case["parse_pdf"], stages = measure(lambda: parse_pdf(client, pdf, lang), track_memory)
+    case["parse_pdf"]["stages"] = stages
+    return case
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Find timings that got slower, or peak resident memory that grew, against
+    the baseline
+    Args:
+        report: Report of this run
+        baseline: Report loaded from a baseline file
+        tolerance: Allowed slowdown or growth, e.g. 0.2 for 20%
+    Returns:
+        Descriptions of the regressions
+    """
+    previous = {(case["kind"], case["pages"]): case for case in baseline["results"]}
+    regressions = []
+    for case in report["results"]:
+        old = previous.get((case["kind"], case["pages"]))
+        if old is None:
+            continue
+        timings = [(name, result, old["extractors"].get(name))
+                   for name, result in case["extractors"].items()]
+        timings.append(("parse_pdf", case["parse_pdf"], old["parse_pdf"]))
+        for name, result, old_result in timings:
+            if not old_result:
+                continue
+            for measurement, unit, digits in (("seconds", "s", 4), ("peak_rss_mb", "MB", 1)):
+                if not old_result.get(measurement) or measurement not in result:
+                    continue
+                ratio = result[measurement] / old_result[measurement]
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{case['kind']}/{case['pages']} {name}: "
+                                       f"{old_result[measurement]:.{digits}f}{unit} -> "
+                                       f"{result[measurement]:.{digits}f}{unit} (x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--lang", default="es", help="Target language; 'en' skips translation")
+    parser.add_argument("--model-ms", type=float, default=0.0,
+                        help="CPU time the stub models spend per input")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the peak traced and resident memory measurement")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline")
+    args = parser.parse_args()
+
+    install_stub_models(args.model_ms / 1000)
+    client = server.app.test_client()
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "extraction_workers": server.app.config['EXTRACTION_WORKERS'],
+            "model_ms": args.model_ms,
+            "lang": args.lang
+        },
+        "results": []
+    }
+
+    print(f"{'kind':<9} {'pages':>5} {'text s':>8} {'tables s':>9} {'formulas s':>11} "
+          f"{'images s':>9} {'parse s':>8} {'traced MB':>10} {'rss MB':>8}")
+    for kind in args.kinds:
+        for pages in args.pages:
+            case = run_case(client, kind, pages, args.lang, not args.no_memory)
+            report["results"].append(case)
+            extractors = case["extractors"]
+            print(f"{kind:<9} {pages:>5} {extractors['text']['seconds']:>8.3f} "
+                  f"{extractors['tables']['seconds']:>9.3f} {extractors['formulas']['seconds']:>11.3f} "
+                  f"{extractors['images']['seconds']:>9.3f} {case['parse_pdf']['seconds']:>8.3f} "
+                  f"{case['parse_pdf'].get('peak_traced_mb', 0):>10.1f} "
+                  f"{case['parse_pdf'].get('peak_rss_mb', 0):>8.1f}")
+    report["environment"]["rss_mb"] = round(psutil.Process().memory_info().rss / 1024 / 1024, 1)
+
+    if args.output:
+        with open(os.path.join(LAUNCH_DIR, args.output), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(os.path.join(LAUNCH_DIR, args.compare), encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark the accessible text markup builder against the old string builder
+Generates synthetic text-heavy PDFs and times building the markup for the
+whole document with page_markup and with the previous += implementation.
+
+Usage (from the serever directory):
+    python benchmarks/text_builder.py --pages 10 100 1000
+"""
+# Import required libraries
+import argparse  # Command line options
+import os  # Operating system interfaces
+import sys  # Import path setup
+import time  # Timing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF for PDF processing
+import app as server  # Markup builder under test
+
+
+def make_text_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Create a PDF with pages full of short text lines"""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        for line in range(lines_per_page):
+            page.insert_text((50, 50 + line * 16),
+                             f"Page {page_num + 1}, line {line + 1}: R&D costs < budget for \"unit\" {line}.",
+                             fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def legacy_markup(doc) -> str:
+    """The previous implementation: one += per span over the whole document"""
+    text_content = ""
+    for page_num in range(len(doc)):
+        for block in doc.page_dict(page_num).get("blocks", []):
+            if block["type"] == 0:
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        text_content += f'<span role="text" aria-label="{span["text"]}">{span["text"]}</span>'
+                    text_content += "\n"
+            elif block["type"] == 1:
+                text_content += f'[Image: {block.get("alt", "No description")}]'
+    return text_content
+
+
+def time_builder(build, doc, repeats: int) -> float:
+    """Best wall time of repeats runs"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'chars':>10} {'legacy s':>10} {'builder s':>10} {'per page ms':>12}")
+    for pages in args.pages:
+        with server.DocumentContext(make_text_pdf(pages), max_page_dicts=pages) as doc:
+            # Compute the text layout up front so only markup building is timed
+            for page_num in range(len(doc)):
+                doc.page_dict(page_num)
+            markup = "".join(server.iter_text_fragments(doc))
+            legacy = time_builder(legacy_markup, doc, args.repeats)
+            builder = time_builder(lambda d: "".join(server.iter_text_fragments(d)), doc, args.repeats)
+        print(f"{pages:>6} {len(markup):>10} {legacy:>10.4f} {builder:>10.4f} {builder / pages * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
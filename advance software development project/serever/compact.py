@@ -0,0 +1,139 @@
+# Import required libraries
+import gzip  # Response compression
+import re  # Span markup
+
+try:
+    import zstandard  # Optional, compresses faster and smaller than gzip
+except ImportError:
+    zstandard = None
+
+COMPACT_MIMETYPE = "application/vnd.accessible-pdf.compact+json"
+COMPACT_FORMAT = "compact-v1"
+
+# A text span as written by page_markup; only spans whose aria-label equals
+# their content are stored by index, anything else stays literal markup
+TEXT_SPAN = re.compile(r'<span role="text" aria-label="([^"<]*)">([^<]*)</span>')
+
+# Per record list, the fields whose value can be derived from the record
+IMPLIED_FIELDS = {
+    "tables": {
+        "headers": lambda table: table["rows"][0] if table.get("rows") else []
+    },
+    "images": {
+        "aria-label": lambda img: f"Image described as: {img.get('alt_text')}"
+    },
+    "formulas": {
+        "role": lambda formula: "math",
+        "aria-label": lambda formula: formula.get("description")
+    }
+}
+
+
+def encode_text(text: str) -> dict:
+    """
+    Deduplicate the spans of accessible markup
+    Args:
+        text: Text with <span> accessibility markup
+    Returns:
+        {"strings": distinct span texts, "units": list of string indexes and
+        literal markup}; the text is the units joined, with each index
+        replaced by its span
+    """
+    strings = []
+    index = {}
+    units = []
+    position = 0
+    for match in TEXT_SPAN.finditer(text):
+        label, content = match.groups()
+        if label != content:
+            continue
+        if match.start() > position:
+            units.append(text[position:match.start()])
+        if content not in index:
+            index[content] = len(strings)
+            strings.append(content)
+        units.append(index[content])
+        position = match.end()
+    if position < len(text):
+        units.append(text[position:])
+    return {"strings": strings, "units": units}
+
+
+def encode_records(records: list, implied: dict) -> dict:
+    """
+    Turn a list of records into columns, leaving out derivable values
+    Args:
+        records: List of dictionaries
+        implied: Field name -> callable deriving the field from a record
+    Returns:
+        {"count": number of records, "columns": field -> list of values, or
+        None if the field is derived for every record}
+    """
+    fields = list(dict.fromkeys(field for record in records for field in record))
+    columns = {}
+    for field in fields:
+        values = [record.get(field) for record in records]
+        derive = implied.get(field)
+        # A real null could not be told apart from a derived one
+        if derive is not None and None not in values:
+            values = [None if value == derive(record) else value
+                      for record, value in zip(records, values)]
+            if all(value is None for value in values):
+                values = None
+        columns[field] = values
+    return {"count": len(records), "columns": columns}
+
+
+def encode_document(result: dict) -> dict:
+    """Compact layout of one /parse-pdf result"""
+    encoded = {**result, "format": COMPACT_FORMAT}
+    if isinstance(result.get("text"), str):
+        encoded["text"] = encode_text(result["text"])
+    for key, implied in IMPLIED_FIELDS.items():
+        if isinstance(result.get(key), list):
+            encoded[key] = encode_records(result[key], implied)
+    return encoded
+
+
+def encode_result(result: dict) -> dict:
+    """
+    Compact layout of a /parse-pdf or /parse-batch result
+    Every distinct text span is stored once and referred to by index, and
+    the lists of tables, images and formulas become columns without the
+    values the client can derive from the rest of a record. In a column,
+    null stands for one derived value; a column that is null instead of a
+    list is derived for every record. expandCompactResult in the viewer
+    restores the original layout.
+    Args:
+        result: Response payload
+    Returns:
+        Payload marked with "format": "compact-v1"
+    """
+    if isinstance(result.get("documents"), list):
+        return {
+            **result,
+            "format": COMPACT_FORMAT,
+            "documents": [encode_document(document) if document.get("status") == "success"
+                          else document for document in result["documents"]]
+        }
+    return encode_document(result)
+
+
+def available_encodings() -> list:
+    """Content codings the server can produce, preferred first"""
+    return ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body
+    Args:
+        body: Serialized response
+        encoding: "zstd" or "gzip"
+    Returns:
+        Compressed body
+    """
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    # Fixed mtime so identical results compress to identical bytes
+    return gzip.compress(body, compresslevel=6, mtime=0)
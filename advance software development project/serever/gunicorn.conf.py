@@ -0,0 +1,28 @@
+# Gunicorn configuration for the PDF processing server
+# Run with: WARM_MODELS=captioning,translator,text gunicorn app:app
+import os  # Operating system interfaces
+
+bind = "0.0.0.0:8000"
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+# Lets each worker take its share of the admission budget and of the cores for
+# page extraction (see app.py); set the worker count through GUNICORN_WORKERS
+# rather than -w so it stays in sync
+os.environ["SERVER_WORKERS"] = str(workers)
+threads = 4  # parse_pdf waits on the job queue, so threads stay cheap
+timeout = 600  # Large PDFs can take minutes to process
+
+# Import the app, and warm up the models listed in WARM_MODELS, once in the
+# master process; forked workers then share the model weights copy-on-write.
+# The SQLite caches connect lazily, so every worker opens its own connection
+preload_app = True
+
+
+def post_fork(server, worker):
+    """
+    Apply INFERENCE_THREADS in every worker process, and fork its page
+    extraction processes while it does not run any other thread yet
+    """
+    from app import app, configure_torch_threads, get_extraction_pool
+    configure_torch_threads()
+    if app.config['EXTRACTION_WORKERS'] > 1:
+        get_extraction_pool()
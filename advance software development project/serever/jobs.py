@@ -0,0 +1,315 @@
+# Import required libraries
+import json  # Result serialization
+import logging  # Logging facility
+import os  # Operating system interfaces
+import sqlite3  # Job state shared across worker processes
+import threading  # Job state synchronization
+import time  # Timestamps for status and retention
+import traceback  # Stack trace printing
+import uuid  # Job identifiers
+from concurrent.futures import ThreadPoolExecutor  # Bounded worker pool
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when no more jobs can be accepted"""
+
+
+class Job:
+    """
+    A single PDF processing job and its progress
+    Handlers call report() as they move through the processing stages.
+    """
+
+    def __init__(self, on_report=None):
+        """
+        Args:
+            on_report: Optional callable(job) called after every report()
+        """
+        self.id = uuid.uuid4().hex
+        self.status = "queued"  # queued -> running -> done | failed
+        self.stage = "queued"
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._done = threading.Event()
+        self._on_report = on_report
+
+    def report(self, stage: str, progress: float):
+        """
+        Record the current processing stage
+        Args:
+            stage: Name of the stage being worked on
+            progress: Completed fraction of the job, from 0 to 1
+        """
+        self.stage = stage
+        self.progress = round(min(max(progress, 0.0), 1.0), 3)
+        if self._on_report is not None:
+            self._on_report(self)
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until the job has finished
+        Args:
+            timeout: Maximum number of seconds to wait
+        Returns:
+            True if the job finished within the timeout
+        """
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        """Status information safe to return to clients"""
+        status = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "created": self.created,
+            "finished": self.finished
+        }
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+class JobStore:
+    """
+    Status and results of jobs in SQLite, shared by every worker process
+    A job submitted to one gunicorn worker can then be polled through any
+    other. Each process opens its own connection, as with PersistentCache.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._inherited = []  # Connections of parent processes, never used or closed
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Connection of the current process, opened on first use (lock must be held)"""
+        if self._pid != os.getpid():
+            if self._connection is not None:
+                self._inherited.append(self._connection)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")  # Concurrent readers across workers
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "stage TEXT NOT NULL, progress REAL NOT NULL, created REAL NOT NULL, "
+                "finished REAL, error TEXT, result TEXT)")
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def save(self, job: Job) -> bool:
+        """
+        Write the whole state of a job, including its result once finished
+        Returns:
+            True if the job was stored
+        """
+        result = json.dumps(job.result, ensure_ascii=False) if job.finished is not None else None
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job.id, job.status, job.stage, job.progress, job.created,
+                     job.finished, job.error, result))
+                self._db.commit()
+                return True
+            except sqlite3.Error as e:
+                logger.warning(f"Saving job {job.id} failed: {str(e)}")
+                return False
+
+    def save_progress(self, job: Job):
+        """Write the stage and progress of a running job"""
+        with self._lock:
+            try:
+                self._db.execute("UPDATE jobs SET stage = ?, progress = ? WHERE id = ?",
+                                 (job.stage, job.progress, job.id))
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Saving progress of job {job.id} failed: {str(e)}")
+
+    def load(self, job_id: str):
+        """
+        Read a job written by any process
+        Returns:
+            Snapshot of the job, or None if unknown
+        """
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT status, stage, progress, created, finished, error, result "
+                    "FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Loading job {job_id} failed: {str(e)}")
+                return None
+        if row is None:
+            return None
+        job = Job()
+        job.id = job_id
+        job.status, job.stage, job.progress, job.created, job.finished, job.error, result = row
+        if job.finished is not None:
+            job.result = json.loads(result) if result is not None else None
+            job._done.set()
+        return job
+
+    def delete(self, job_id: str):
+        """Forget a job"""
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Deleting job {job_id} failed: {str(e)}")
+
+    def expire(self, cutoff: float, max_finished: int):
+        """
+        Forget old jobs
+        Args:
+            cutoff: Jobs finished, or created if never finished (their
+                worker died), before this time are deleted
+            max_finished: Maximum number of finished jobs kept
+        """
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM jobs WHERE COALESCE(finished, created) < ?", (cutoff,))
+                self._db.execute(
+                    "DELETE FROM jobs WHERE id IN (SELECT id FROM jobs WHERE finished IS NOT NULL "
+                    "ORDER BY finished DESC LIMIT -1 OFFSET ?)", (max_finished,))
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Expiring jobs failed: {str(e)}")
+
+
+class JobQueue:
+    """
+    In-process job queue served by a bounded pool of worker threads
+    Finished jobs are kept for retention seconds so clients can fetch results,
+    at most max_finished of them; callers that already took the result
+    discard the job. With a store, jobs are also visible to other worker
+    processes, and finished ones are kept only in the store.
+    """
+
+    def __init__(self, handler, workers: int = 2, max_pending: int = 32,
+                 retention: float = 3600, max_finished: int = 100, store: JobStore = None):
+        """
+        Args:
+            handler: Callable run as handler(job, *args); its return value
+                becomes the job result
+            workers: Number of jobs processed concurrently
+            max_pending: Maximum number of queued or running jobs
+            retention: Seconds a finished job stays available
+            max_finished: Maximum number of finished jobs kept; the oldest
+                are forgotten first
+            store: Optional JobStore shared with other worker processes
+        """
+        self.handler = handler
+        self.max_pending = max_pending
+        self.retention = retention
+        self.max_finished = max_finished
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, *args, persist: bool = True) -> Job:
+        """
+        Queue a new job
+        Args:
+            *args: Arguments passed to the handler after the job
+            persist: Write the job to the store so it can be polled from any
+                worker; callers waiting for the result themselves skip it
+        Returns:
+            The queued job
+        Raises:
+            QueueFullError: If max_pending jobs are already waiting or running
+        """
+        with self._lock:
+            self._expire()
+            pending = sum(1 for job in self._jobs.values() if job.finished is None)
+            if pending >= self.max_pending:
+                raise QueueFullError("Too many documents are being processed, try again later")
+            persisted = persist and self.store is not None
+            job = Job(on_report=self.store.save_progress if persisted else None)
+            self._jobs[job.id] = job
+        if persisted:
+            self.store.save(job)
+
+        self._executor.submit(self._run, job, args, persisted)
+        return job
+
+    def get(self, job_id: str):
+        """
+        Look up a job
+        Args:
+            job_id: Identifier returned by submit
+        Returns:
+            The job, or None if unknown or expired
+        """
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            # Finished, or submitted to another worker process
+            job = self.store.load(job_id)
+        return job
+
+    def discard(self, job_id: str):
+        """
+        Forget a finished job whose result has been delivered
+        Args:
+            job_id: Identifier returned by submit
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished is not None:
+                del self._jobs[job_id]
+        if job is None and self.store is not None:
+            self.store.delete(job_id)
+
+    def _run(self, job: Job, args: tuple, persisted: bool):
+        """Execute a job on a worker thread"""
+        job.status = "running"
+        job.report("started", 0.0)
+        if persisted:
+            self.store.save(job)
+        try:
+            job.result = self.handler(job, *args)
+            job.status = "done"
+            job.report("done", 1.0)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {traceback.format_exc()}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
+            if persisted and self.store.save(job):
+                # The store holds the result from now on
+                with self._lock:
+                    self._jobs.pop(job.id, None)
+            job._done.set()
+
+    def _expire(self):
+        """Forget finished jobs past the retention period or count (lock must be held)"""
+        cutoff = time.time() - self.retention
+        finished = sorted((job.finished, job_id) for job_id, job in self._jobs.items()
+                          if job.finished is not None)
+        excess = len(finished) - self.max_finished
+        for index, (finished_at, job_id) in enumerate(finished):
+            if index < excess or finished_at < cutoff:
+                del self._jobs[job_id]
+        if self.store is not None:
+            self.store.expire(cutoff, self.max_finished)
@@ -0,0 +1,168 @@
+# Import required libraries
+import contextvars  # Per-request timings
+import math  # Infinite bucket bound
+import os  # Process id label
+import threading  # Locking for concurrent requests
+import time  # Stage timing
+from contextlib import contextmanager  # Context manager helpers
+
+# Seconds; stages range from sub-millisecond formula scans to minute-long captioning
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Stage timings of the request being processed by the current thread
+current_timings = contextvars.ContextVar("current_timings", default=None)
+
+
+def label_text(labels: tuple) -> str:
+    """Prometheus label set, e.g. {stage="open"}"""
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        """Add amount to the counter of a label set"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels):
+        """Copy a total kept elsewhere, such as cache hit counters"""
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+    def samples(self) -> list:
+        with self._lock:
+            return [(self.name, labels, value) for labels, value in self._values.items()]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values = {}  # labels -> (bucket counts, sum)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Record one observation for a label set"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def samples(self) -> list:
+        samples = []
+        with self._lock:
+            for labels, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(float(bound))
+                    samples.append((f"{self.name}_bucket", labels + (("le", le),), cumulative))
+                samples.append((f"{self.name}_sum", labels, total))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Metrics of one process, rendered in the Prometheus text format
+    Every worker process keeps its own values, like the cache statistics, so
+    each sample is labelled with the worker's process id. Scrapes answered by
+    different workers then update different series instead of looking like
+    counter resets; sum over the worker label to aggregate.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        """Create and register a counter"""
+        metric = Counter(name, documentation)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        """Create and register a histogram"""
+        metric = Histogram(name, documentation, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        worker = (("worker", os.getpid()),)
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{label_text(worker + labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def collect_timings():
+    """
+    Collect the stage timings recorded by the current thread
+    Yields:
+        Dictionary of stage name to seconds, filled in as stages finish
+    """
+    timings = {}
+    token = current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        current_timings.reset(token)
+
+
+def record_stage(histogram: Histogram, stage: str, seconds: float):
+    """
+    Record the duration of a stage
+    Observed on the histogram and added to the timings of the current
+    request, if they are being collected.
+    Args:
+        histogram: Histogram with a stage label
+        stage: Name of the stage
+        seconds: Duration of the stage
+    """
+    histogram.observe(seconds, stage=stage)
+    timings = current_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def timed(histogram: Histogram, stage: str):
+    """
+    Time a block as one observation of a stage
+    Args:
+        histogram: Histogram with a stage label
+        stage: Name of the stage
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(histogram, stage, time.perf_counter() - start)
@@ -0,0 +1,87 @@
+# Import required libraries
+import logging  # Logging facility
+import threading  # Per-model load locks
+import time  # Warm-up budget
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, process-wide AI models
+    Each model is loaded on first use and then shared by every request of the
+    process. Models loaded before the server forks its workers (see warm_up
+    and gunicorn.conf.py) are shared with them copy-on-write.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader):
+        """
+        Register how to load a model
+        Args:
+            name: Name used with get()
+            loader: Callable returning the loaded model
+        """
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+            self._models.pop(name, None)
+
+    def get(self, name: str):
+        """
+        Return a model, loading it on first use
+        Args:
+            name: Registered model name
+        Returns:
+            The loaded model
+        Raises:
+            RuntimeError: If the model fails to load
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                start = time.perf_counter()
+                try:
+                    self._models[name] = self._loaders[name]()
+                except Exception as e:
+                    logger.error(f"Model initialization failed for {name}: {str(e)}")
+                    raise RuntimeError(f"Failed to initialize AI model '{name}'") from e
+                logger.info(f"Loaded model {name} in {time.perf_counter() - start:.1f}s")
+        return self._models[name]
+
+    def loaded(self) -> list:
+        """Names of the models currently in memory"""
+        return sorted(self._models)
+
+    def warm_up(self, names: list, budget_seconds: float = None) -> list:
+        """
+        Load models ahead of the first request
+        Args:
+            names: Model names, loaded in this order
+            budget_seconds: Stop starting new loads once this much time has
+                passed; the remaining models load lazily
+        Returns:
+            Names of the models that were loaded
+        """
+        start = time.perf_counter()
+        warmed = []
+        for name in names:
+            if budget_seconds is not None and time.perf_counter() - start >= budget_seconds:
+                logger.info(f"Warm-up budget spent, deferring {name}")
+                continue
+            try:
+                self.get(name)
+                warmed.append(name)
+            except RuntimeError:
+                # Already logged; the model will be retried on first use
+                continue
+        return warmed
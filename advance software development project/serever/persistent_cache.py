@@ -0,0 +1,203 @@
+# Import required libraries
+import json  # Value serialization
+import logging  # Logging facility
+import os  # Operating system interfaces
+import sqlite3  # Local persistent store
+import threading  # Locking for concurrent requests
+import time  # Access times for eviction
+from collections import OrderedDict  # In-process LRU
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentCache:
+    """
+    SQLite-backed key/value cache with an in-process LRU in front
+    Values are stored as JSON so they survive restarts and are shared by
+    every worker process on the machine. Once the table holds more than
+    max_entries rows or max_bytes of keys and values, the least recently
+    used rows are evicted, whichever process used them. Hit and miss
+    counters are kept per process, and each process opens its own database
+    connection: SQLite connections must not be carried across fork(), and
+    gunicorn imports the app in the master before forking the workers.
+    """
+
+    def __init__(self, path: str, table: str, memory_items: int = 4096,
+                 max_bytes: int = None, max_entries: int = None):
+        """
+        Args:
+            path: SQLite database file
+            table: Table name inside the database
+            memory_items: Number of entries kept in the in-process LRU
+            max_bytes: Optional size budget of the stored keys and values
+            max_entries: Optional maximum number of stored entries
+        """
+        self.path = path
+        self.table = table
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._connection = None
+        self._pid = None
+        self._inherited = []  # Connections of parent processes, never used or closed
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Connection of the current process, opened on first use (lock must be held)"""
+        if self._pid != os.getpid():
+            # Never reuse a connection inherited from the parent process, and
+            # never close it either: closing could checkpoint the parent's WAL
+            if self._connection is not None:
+                self._inherited.append(self._connection)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")  # Concurrent readers across workers
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            columns = [row[1] for row in self._connection.execute(f"PRAGMA table_info({self.table})")]
+            if "accessed" not in columns:
+                # Tables created before eviction existed start as least recently used
+                self._connection.execute(
+                    f"ALTER TABLE {self.table} ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                self._connection.execute(
+                    f"ALTER TABLE {self.table} ADD COLUMN accessed REAL NOT NULL DEFAULT 0")
+                self._connection.execute(
+                    f"UPDATE {self.table} SET size = length(key) + length(CAST(value AS BLOB))")
+            # Covers the eviction scans without reading the values
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_lru ON {self.table} (accessed, size)")
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _remember(self, key: str, value):
+        """Insert into the in-process LRU (lock must be held)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """
+        Look up one value
+        Args:
+            key: Cache key
+        Returns:
+            Stored value, or None on a miss
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Look up several values with a single database query
+        Args:
+            keys: Cache keys
+        Returns:
+            Dictionary with the keys that were found
+        """
+        found = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                try:
+                    rows = self._db.execute(
+                        f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders})",
+                        chunk).fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"Cache lookup in {self.table} failed: {str(e)}")
+                    rows = []
+                for key, value in rows:
+                    found[key] = json.loads(value)
+                    self._remember(key, found[key])
+
+            if found and (self.max_bytes or self.max_entries):
+                self._touch(list(found))
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(dict.fromkeys(keys)) - len(found)
+        return found
+
+    def set(self, key: str, value):
+        """
+        Store one value
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        """
+        Store several values in one transaction
+        Args:
+            items: Mapping of cache key to JSON-serializable value
+        """
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            data = json.dumps(value, ensure_ascii=False)
+            rows.append((key, data, len(key) + len(data.encode("utf-8")), now))
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            try:
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                    rows)
+                self._evict()
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache write to {self.table} failed: {str(e)}")
+
+    def _touch(self, keys: list):
+        """Mark entries as recently used (lock must be held)"""
+        try:
+            self._db.executemany(f"UPDATE {self.table} SET accessed = ? WHERE key = ?",
+                                 [(time.time(), key) for key in keys])
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Cache access update in {self.table} failed: {str(e)}")
+
+    def _evict(self):
+        """Delete least recently used entries until within budget (lock must be held)"""
+        if not self.max_bytes and not self.max_entries:
+            return
+        count, total = self._db.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        excess_entries = count - self.max_entries if self.max_entries else 0
+        excess_bytes = total - self.max_bytes if self.max_bytes else 0
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+
+        evicted = []
+        cursor = self._db.execute(f"SELECT rowid, key, size FROM {self.table} ORDER BY accessed")
+        for rowid, key, size in cursor:
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            evicted.append((rowid, key))
+            excess_entries -= 1
+            excess_bytes -= size
+        cursor.close()
+        self._db.executemany(f"DELETE FROM {self.table} WHERE rowid = ?",
+                             [(rowid,) for rowid, _ in evicted])
+        for _, key in evicted:
+            self._memory.pop(key, None)
+        logger.info(f"Evicted {len(evicted)} entries from {self.table}")
@@ -0,0 +1,159 @@
+# Import required libraries
+import hashlib  # Content hashing for cache keys
+import json  # Payload serialization
+import logging  # Logging facility
+import os  # Operating system interfaces
+import threading  # Locking for concurrent requests
+from collections import OrderedDict  # LRU bookkeeping
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Persistent on-disk cache for final /parse-pdf payloads
+    Entries are stored as JSON files named after their key and evicted in
+    least-recently-used order once the entry count or byte budget is exceeded
+    The directory is shared by every worker process: an entry written by
+    another worker is adopted on lookup, and the budget is enforced from a
+    scan of the directory, with file modification times as recency
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_entries: int = 1000):
+        """
+        Args:
+            directory: Folder holding the cached JSON files
+            max_bytes: Total size budget for all cached entries
+            max_entries: Maximum number of cached entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        self.stats = {"hits": 0, "misses": 0}  # Lookups in this process
+
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._load_index()
+            self._evict()
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes, target_lang: str, model_versions: dict) -> str:
+        """
+        Build a content-addressed cache key
+        Args:
+            pdf_bytes: Raw bytes of the uploaded PDF
+            target_lang: Target language of the request
+            model_versions: Mapping of model role to model identifier
+        Returns:
+            Hex digest identifying the document, language and models
+        """
+        digest = hashlib.sha256(pdf_bytes)
+        digest.update(b"\0" + target_lang.encode("utf-8"))
+        for role, version in sorted(model_versions.items()):
+            digest.update(f"\0{role}={version}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk (lock must be held)"""
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue  # Evicted by another worker meanwhile
+            found.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+
+        # Oldest modification time first, so it is evicted first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str):
+        """
+        Look up a cached payload
+        Args:
+            key: Key produced by make_key
+        Returns:
+            Cached payload dictionary, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                size = os.fstat(f.fileno()).st_size
+                payload = json.load(f)
+            os.utime(path)  # Recency shared with other workers and restarts
+        except FileNotFoundError:
+            # Never written, or evicted by another worker
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.stats["misses"] += 1
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {str(e)}")
+            with self._lock:
+                self._forget(key)
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["hits"] += 1
+            if key not in self._entries:
+                # Written by another worker
+                self._entries[key] = size
+                self._total_bytes += size
+            self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: dict):
+        """
+        Store a payload, evicting old entries if over budget
+        Args:
+            key: Key produced by make_key
+            payload: JSON-serializable response payload
+        """
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        # Write to a temporary file first so readers never see partial JSON
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Result cache write failed: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            # Other workers add and evict entries too, so budget from the directory
+            self._load_index()
+            self._evict()
+
+    def _forget(self, key: str):
+        """Remove an entry from the index and from disk (lock must be held)"""
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used entries until within budget (lock must be held)"""
+        while self._entries and (self._total_bytes > self.max_bytes or
+                                 len(self._entries) > self.max_entries):
+            oldest = next(iter(self._entries))
+            self._forget(oldest)
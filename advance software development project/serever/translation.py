@@ -0,0 +1,282 @@
+# Import required libraries
+import hashlib  # Translation memory keys
+import html  # Escaping split span text
+import logging  # Logging facility
+import re  # Markup and sentence boundaries
+import time  # Batch timing
+
+logger = logging.getLogger(__name__)
+
+# A whole span element, a line break, or a run of plain text between them
+MARKUP_UNIT = re.compile(r'<span[^>]*>.*?</span>|\n|[^<\n]+|<', re.DOTALL)
+SPAN_TEXT = re.compile(r'<span[^>]*>(.*?)</span>', re.DOTALL)
+# Visible text that ends a sentence
+SENTENCE_END = re.compile(r'[.!?\u3002]["\'\u201d)\]]*\s*$')
+
+
+def unit_text(unit: str) -> str:
+    """Visible text of a markup unit"""
+    match = SPAN_TEXT.fullmatch(unit)
+    return match.group(1) if match else unit
+
+
+def split_sentences(text: str) -> list:
+    """
+    Split accessible markup into sentences without breaking any markup
+    Args:
+        text: Text with <span> accessibility markup
+    Returns:
+        List of markup strings that concatenate back to text
+    """
+    sentences = []
+    current = []
+    for unit in MARKUP_UNIT.findall(text):
+        current.append(unit)
+        if SENTENCE_END.search(unit_text(unit)):
+            sentences.append("".join(current))
+            current = []
+    if current:
+        sentences.append("".join(current))
+    return sentences
+
+
+def split_oversized(sentence: str, count_tokens, max_tokens: int) -> list:
+    """
+    Break a sentence longer than max_tokens into well-formed pieces
+    Pieces end on unit boundaries; a single span that is still too long is
+    split between words into several spans, each filled up to max_tokens
+    including its markup.
+    """
+    pieces = []
+    current = ""
+    for unit in MARKUP_UNIT.findall(sentence):
+        if count_tokens([unit])[0] > max_tokens:
+            if current:
+                pieces.append(current)
+                current = ""
+            wrap = SPAN_TEXT.fullmatch(unit) is not None
+
+            def render(words: list) -> str:
+                escaped = html.escape(" ".join(words))
+                return f'<span role="text" aria-label="{escaped}">{escaped}</span>' if wrap else escaped
+
+            part = []
+            for word in html.unescape(unit_text(unit)).split(" "):
+                # Words that were split apart stay separated by a space
+                if part and count_tokens([render(part + [word]) + " "])[0] > max_tokens:
+                    pieces.append(render(part) + " ")
+                    part = []
+                part.append(word)
+            pieces.append(render(part))
+            continue
+        if current and count_tokens([current + unit])[0] > max_tokens:
+            pieces.append(current)
+            current = ""
+        current += unit
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_markup(text: str, count_tokens, max_tokens: int) -> list:
+    """
+    Pack whole sentences into chunks that fit the model's input limit
+    Args:
+        text: Text with <span> accessibility markup
+        count_tokens: Callable returning the token count of each string in a list
+        max_tokens: Maximum number of tokens per chunk
+    Returns:
+        List of chunks that concatenate back to text (apart from spans that
+        had to be split)
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence, tokens in zip(sentences, count_tokens(sentences)):
+        if tokens > max_tokens:
+            # The pieces of a long sentence are packed like sentences
+            pieces = split_oversized(sentence, count_tokens, max_tokens)
+            parts = zip(pieces, count_tokens(pieces))
+        else:
+            parts = [(sentence, tokens)]
+        for part, part_tokens in parts:
+            if current and current_tokens + part_tokens > max_tokens:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+class TranslationService:
+    """
+    Batched translation over the Hugging Face pipelines
+    Strings are deduplicated, sorted by length so each padded batch holds
+    similarly sized inputs, sent through the pipeline in fixed-size batches
+    and scattered back to their original positions. Strings found in the
+    translation memory skip inference altogether.
+    """
+
+    def __init__(self, get_pipeline, batch_size: int = 16, generate_kwargs: dict = None,
+                 memory=None, model_ids: dict = None, on_batch=None):
+        """
+        Args:
+            get_pipeline: Callable returning the pipeline for an engine name
+                ("translator" for short strings, "text" for document text);
+                only called when something needs translating
+            batch_size: Maximum number of strings per forward pass
+            generate_kwargs: Decoding settings passed to every pipeline call
+            memory: Optional PersistentCache used as translation memory
+            model_ids: Model identifier per engine name, part of the memory key
+            on_batch: Optional callable(engine, batch_size, seconds) called
+                after every forward pass
+        """
+        self.get_pipeline = get_pipeline
+        self.batch_size = batch_size
+        self.generate_kwargs = generate_kwargs or {}
+        self.memory = memory
+        self.model_ids = model_ids or {}
+        self.on_batch = on_batch
+
+    def max_input_tokens(self, engine: str) -> int:
+        """
+        Longest input, in tokens, that the engine translates without truncation
+        Bounded by both the tokenizer limit and the generation length, since
+        the translation is about as long as its source.
+        """
+        pipe = self.get_pipeline(engine)
+        limits = [pipe.tokenizer.model_max_length]
+        generation_config = getattr(pipe.model, "generation_config", None)
+        if getattr(generation_config, "max_length", None):
+            limits.append(generation_config.max_length)
+        # Leave room for the language and end-of-sequence tokens
+        return min(limit for limit in limits if limit) - 4
+
+    def chunk_text(self, text: str, engine: str = "text", max_tokens: int = None) -> list:
+        """
+        Split document markup into sentence-aligned chunks for translation
+        Args:
+            text: Text with accessibility markup
+            engine: Name of the pipeline whose tokenizer and limits apply
+            max_tokens: Optional lower limit on the tokens per chunk
+        Returns:
+            List of chunks; joining them gives back the text
+        """
+        tokenizer = self.get_pipeline(engine).tokenizer
+        limit = self.max_input_tokens(engine)
+        if max_tokens:
+            limit = min(limit, max_tokens)
+
+        def count_tokens(texts):
+            return [len(ids) for ids in
+                    tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+        return chunk_markup(text, count_tokens, limit)
+
+    def memory_key(self, text: str, target_lang: str, engine: str) -> str:
+        """Translation memory key of a source string, language and model"""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model_ids.get(engine, engine)}:{target_lang}:{digest}"
+
+    def translate(self, texts: list, target_lang: str, engine: str = "translator") -> list:
+        """
+        Translate a list of strings
+        Args:
+            texts: Strings to translate; duplicates are translated once
+            target_lang: Target language code
+            engine: Name of the pipeline to use
+        Returns:
+            Translations in the same order as texts
+        """
+        unique = sorted(set(texts), key=len)
+        translations = {}
+        if self.memory is not None and unique:
+            keys = {text: self.memory_key(text, target_lang, engine) for text in unique}
+            known = self.memory.get_many(list(keys.values()))
+            translations = {text: known[key] for text, key in keys.items() if key in known}
+            unique = [text for text in unique if text not in translations]
+
+        new_translations = {}
+        for start in range(0, len(unique), self.batch_size):
+            chunk = unique[start:start + self.batch_size]
+            batch_start = time.perf_counter()
+            new_translations.update(zip(chunk, self._run(engine, chunk, target_lang)))
+            if self.on_batch is not None:
+                self.on_batch(engine, len(chunk), time.perf_counter() - batch_start)
+        if self.memory is not None and new_translations:
+            self.memory.set_many({keys[text]: translation
+                                  for text, translation in new_translations.items()})
+        translations.update(new_translations)
+        return [translations[text] for text in texts]
+
+    def _run(self, engine: str, texts: list, target_lang: str) -> list:
+        """Run one padded batch through a pipeline"""
+        pipe = self.get_pipeline(engine)
+        if engine == "text":
+            outputs = pipe(texts, batch_size=len(texts),
+                           forced_bos_token_id=pipe.tokenizer.get_lang_id(target_lang),
+                           **self.generate_kwargs)
+            key = "generated_text"
+        else:
+            outputs = pipe(texts, batch_size=len(texts), target_lang=target_lang,
+                           **self.generate_kwargs)
+            key = "translation_text"
+        # Pipelines return either one dict or a one-element list per input
+        return [(output[0] if isinstance(output, list) else output)[key]
+                for output in outputs]
+
+
+class TranslationBatch:
+    """
+    Collects every string one request needs translated
+    Callers register where each translation should be written with add();
+    run() then translates everything in as few forward passes as possible.
+    Nothing is queued when the target language is English.
+    """
+
+    def __init__(self, service: TranslationService, target_lang: str):
+        """
+        Args:
+            service: Translation service used by run()
+            target_lang: Target language code
+        """
+        self.service = service
+        self.target_lang = target_lang
+        self._pending = {}  # engine -> list of (container, key, text, template)
+
+    def add(self, container, key, text: str = None, engine: str = "translator",
+            template: str = "{}"):
+        """
+        Queue a string; its translation is written to container[key] by run()
+        Args:
+            container: Dictionary or list receiving the translation
+            key: Key or index within container
+            text: Source string (defaults to the current container[key])
+            engine: Name of the pipeline to use
+            template: Format string applied to the translation
+        """
+        if self.target_lang == "en":
+            return
+        if text is None:
+            text = container[key]
+        if not isinstance(text, str) or not text.strip():
+            return
+        self._pending.setdefault(engine, []).append((container, key, text, template))
+
+    def __len__(self):
+        return sum(len(items) for items in self._pending.values())
+
+    def run(self):
+        """Translate all queued strings and write them back"""
+        for engine, items in self._pending.items():
+            translations = self.service.translate(
+                [text for _, _, text, _ in items], self.target_lang, engine)
+            for (container, key, _, template), translation in zip(items, translations):
+                container[key] = template.format(translation)
+        self._pending = {}